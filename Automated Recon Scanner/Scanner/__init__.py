@@ -1,2 +1,2 @@
 # package marker
-__all__ = ["mock_scanner", "scanner_pseudocode"]
+__all__ = ["mock_scanner", "generate_network", "scanner_pseudocode"]
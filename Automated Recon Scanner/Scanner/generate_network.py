@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+generate_network.py
+
+Write synthetic sample networks for the mock scanner, from a handful of hosts up to 100k+.
+
+The output has the same shape as data/sample_network.json ({"subnet": ..., "hosts": [...]}), or one
+host object per line for a .jsonl path. Hosts are written as they are generated, so file size is the
+only limit. Nothing here touches the network.
+"""
+
+import argparse
+import ipaddress
+import json
+import math
+import random
+import sys
+from typing import Dict, Iterator, Optional
+
+# Ports real hosts tend to expose, weighted roughly by how often they show up in sweeps
+COMMON_PORTS = {80: 30, 443: 25, 22: 20, 3389: 6, 445: 5, 139: 4, 21: 3, 25: 3, 53: 3, 8080: 3,
+                3306: 2, 110: 1, 143: 1, 23: 1}
+
+
+def default_subnet(hosts: int, density: float) -> str:
+    """Smallest 10.0.0.0/x network in which `hosts` live addresses fill about `density` of the space."""
+    needed = max(hosts / max(min(density, 1.0), 1e-6), hosts + 2)
+    prefix = 32 - max(math.ceil(math.log2(needed)), 2)
+    if prefix < 8:
+        raise ValueError(f"{hosts} hosts at density {density} do not fit in 10.0.0.0/8")
+    return f"10.0.0.0/{prefix}"
+
+
+def _address_range(subnet: str, hosts: int):
+    # -> (first usable address as int, number of usable addresses); network/broadcast are skipped
+    network = ipaddress.ip_network(subnet, strict=False)
+    usable = network.num_addresses - 2 if network.num_addresses > 2 else network.num_addresses
+    if hosts > usable:
+        raise ValueError(f"{subnet} has only {usable} usable addresses for {hosts} hosts")
+    return int(network.network_address) + (1 if network.num_addresses > 2 else 0), usable
+
+
+def _open_port_count(rng: random.Random, mean: float) -> int:
+    # Geometric distribution: most hosts expose a few ports, a long tail exposes many
+    if mean <= 0:
+        return 0
+    p = 1 / (mean + 1)
+    return int(math.log(1 - rng.random()) / math.log(1 - p)) if p < 1 else 0
+
+
+def iter_hosts(hosts: int, subnet: str, mean_open_ports: float = 2.0, common_share: float = 0.8,
+               seed: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Yield `hosts` host entries with distinct addresses in `subnet`, in address order.
+    Each host gets a geometric number of open ports (mean `mean_open_ports`); a port is drawn from
+    COMMON_PORTS with probability `common_share`, otherwise uniformly from 1-65535.
+    """
+    rng = random.Random(seed)
+    first, usable = _address_range(subnet, hosts)
+    common, weights = list(COMMON_PORTS), list(COMMON_PORTS.values())
+    for offset in sorted(rng.sample(range(usable), hosts)):
+        address = ipaddress.ip_address(first + offset)
+        ports = set()
+        for _ in range(_open_port_count(rng, mean_open_ports)):
+            if rng.random() < common_share:
+                ports.add(rng.choices(common, weights)[0])
+            else:
+                ports.add(rng.randint(1, 65535))
+        mac = ":".join(f"{b:02X}" for b in [0x02] + [rng.randrange(256) for _ in range(5)])
+        yield {"ip": str(address), "mac": mac, "open_ports": sorted(ports)}
+
+
+def write_network(path: str, hosts: int, subnet: Optional[str] = None, density: float = 0.25,
+                  mean_open_ports: float = 2.0, common_share: float = 0.8, seed: Optional[int] = None) -> str:
+    """Write a synthetic sample network to `path` and return the subnet used."""
+    subnet = subnet or default_subnet(hosts, density)
+    _address_range(subnet, hosts)  # fail before creating the file
+    entries = iter_hosts(hosts, subnet, mean_open_ports, common_share, seed)
+    with open(path, "w") as f:
+        if path.endswith(".jsonl"):
+            for h in entries:
+                f.write(json.dumps(h) + "\n")
+        else:
+            f.write(f'{{"subnet": {json.dumps(subnet)}, "hosts": [')
+            for i, h in enumerate(entries):
+                f.write(("\n  " if not i else ",\n  ") + json.dumps(h))
+            f.write("\n]}\n" if hosts else "]}\n")
+    return subnet
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic sample network for the mock scanner")
+    parser.add_argument("--hosts", "-n", type=int, default=1000, help="Number of live hosts")
+    parser.add_argument("--output", "-o", required=True, help="Output path (.json, or .jsonl for one host per line)")
+    parser.add_argument("--subnet", "-s", help="Subnet to place hosts in (default: sized from --density)")
+    parser.add_argument("--density", type=float, default=0.25,
+                        help="Fraction of the default subnet's addresses that are live hosts")
+    parser.add_argument("--open-ports", type=float, default=2.0, help="Mean number of open ports per host")
+    parser.add_argument("--common-share", type=float, default=0.8,
+                        help="Share of open ports drawn from well-known services rather than 1-65535")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible networks")
+    args = parser.parse_args(argv)
+
+    try:
+        subnet = write_network(args.output, args.hosts, args.subnet, args.density, args.open_ports,
+                               args.common_share, args.seed)
+    except ValueError as e:
+        print(f"Cannot generate network: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"Wrote {args.hosts} hosts in {subnet} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
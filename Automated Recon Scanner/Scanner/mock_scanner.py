@@ -9,12 +9,25 @@ and simulates ARP replies and SYN responses to demonstrate program flow, output,
 """
 
 import argparse
+import ipaddress
 import json
 import os
+import re
 import sys
-from typing import List, Dict, Tuple
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Dict, FrozenSet, Optional, Tuple
 
 DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "sample_network.json")
+REPORT_FILE = os.path.join(os.path.dirname(__file__), "..", "simulated_report.json")
+CHUNK_SIZE = 1 << 16
+
+# ip -> (mac, open ports)
+HostIndex = Dict[str, Tuple[str, FrozenSet[int]]]
+
+# IP version -> (sorted integer addresses, (ip, mac) in the same order)
+AddressIndex = Dict[int, Tuple[array, List[Tuple[str, str]]]]
 
 
 def load_sample_network(path: str) -> Dict:
@@ -22,30 +35,250 @@ def load_sample_network(path: str) -> Dict:
         return json.load(f)
 
 
-def simulate_arp_discovery(subnet: str, sample_data: Dict) -> List[Tuple[str, str]]:
+class _JsonStream:
+    """
+    Minimal incremental reader for one JSON document: values are decoded with raw_decode from a
+    sliding buffer that is refilled in CHUNK_SIZE pieces, so only the current value is held in memory.
+    """
+
+    _whitespace = re.compile(r"\s*")
+
+    def __init__(self, f):
+        self._file = f
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        chunk = self._file.read(CHUNK_SIZE)
+        self._eof = not chunk
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input)."""
+        while True:
+            self._pos = self._whitespace.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos:self._pos + 1]
+            self._fill()
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"expected one of {chars!r} in sample file, found {c or 'end of file'!r}")
+        self._pos += 1
+        return c
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A number that ends at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def iter_sample_hosts(path: str, meta: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Stream host entries from a sample network file without loading it whole.
+    Accepts the usual {"subnet": ..., "hosts": [...]} document (other top-level keys are stored in
+    meta if given) or a .jsonl file with one host object per line.
+    """
+    with open(path, "r") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        stream = _JsonStream(f)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == "hosts":
+                stream.expect("[")
+                if stream.peek() != "]":
+                    while True:
+                        yield stream.value()
+                        if stream.expect(",]") == "]":
+                            break
+                else:
+                    stream.expect("]")
+            else:
+                value = stream.value()
+                if meta is not None:
+                    meta[key] = value
+            if stream.expect(",}") == "}":
+                return
+
+
+def build_address_index(sample_data: Dict) -> AddressIndex:
+    """
+    Sort the sample hosts by integer address (per IP version) so a subnet becomes a binary-search range.
+    Entries with an unparsable IP are skipped; for a repeated IP the first entry wins.
+    """
+    keyed: Dict[int, Dict[int, Tuple[str, str]]] = {}
+    for h in sample_data.get("hosts", []):
+        try:
+            address = ipaddress.ip_address(h["ip"])
+        except ValueError:
+            continue
+        keyed.setdefault(address.version, {}).setdefault(int(address), (h["ip"], h.get("mac", "")))
+    index: AddressIndex = {}
+    for version, hosts in keyed.items():
+        order = sorted(hosts)
+        # IPv4 fits a compact unsigned array; IPv6 needs Python ints
+        addresses = array("L", order) if version == 4 else order
+        index[version] = (addresses, [hosts[a] for a in order])
+    return index
+
+
+def parse_targets(subnet: str) -> List[Tuple[int, int, int]]:
+    """
+    Turn "10.0.0.0/16,192.168.1.5" into merged (version, first, last) integer ranges.
+    Raises ValueError for anything that is not an address or network.
+    """
+    ranges = []
+    for part in subnet.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        network = ipaddress.ip_network(part, strict=False)
+        ranges.append((network.version, int(network.network_address), int(network.broadcast_address)))
+    ranges.sort()
+    merged: List[Tuple[int, int, int]] = []
+    for version, first, last in ranges:
+        if merged and merged[-1][0] == version and first <= merged[-1][2] + 1:
+            merged[-1] = (version, merged[-1][1], max(merged[-1][2], last))
+        else:
+            merged.append((version, first, last))
+    return merged
+
+
+def simulate_arp_discovery(subnet: str, sample_data: Dict,
+                           index: Optional[AddressIndex] = None) -> List[Tuple[str, str]]:
     """
     Simulate ARP discovery by returning IP/MAC tuples from sample data that fall into the subnet.
+    subnet may list several comma-separated networks or addresses; hosts come back in address order.
     This is a pure simulation: no network activity occurs.
     """
-    # For the mock, we trust the sample file's subnet and return all hosts.
+    if index is None:
+        index = build_address_index(sample_data)
     hosts = []
-    for h in sample_data.get("hosts", []):
-        hosts.append((h["ip"], h["mac"]))
+    for version, first, last in parse_targets(subnet):
+        if version not in index:
+            continue
+        addresses, entries = index[version]
+        hosts.extend(entries[bisect_left(addresses, first):bisect_right(addresses, last)])
     return hosts
 
 
-def simulate_port_scan(host_ip: str, ports: List[int], sample_data: Dict) -> Dict[int, str]:
+def build_host_index(sample_data: Dict) -> HostIndex:
+    """
+    Index the sample hosts by IP once, with each host's open ports as a frozenset.
+    If an IP is listed twice, the first entry wins (as with the old linear lookup).
+    """
+    index: HostIndex = {}
+    for h in sample_data.get("hosts", []):
+        if h["ip"] not in index:
+            index[h["ip"]] = (h.get("mac", ""), frozenset(h.get("open_ports", [])))
+    return index
+
+
+def stream_arp_discovery(subnet: str, hosts: Iterable[Dict]) -> Iterator[Tuple[str, str, FrozenSet[int]]]:
+    """
+    Single-pass variant of simulate_arp_discovery for iter_sample_hosts: yields (ip, mac, open ports)
+    for each host inside the target ranges, in file order. Nothing is indexed, so repeated IPs are
+    reported each time they appear.
+    """
+    bounds: Dict[int, Tuple[List[int], List[int]]] = {}
+    for version, first, last in parse_targets(subnet):
+        starts, ends = bounds.setdefault(version, ([], []))
+        starts.append(first)
+        ends.append(last)
+    for h in hosts:
+        try:
+            address = ipaddress.ip_address(h["ip"])
+        except ValueError:
+            continue
+        if address.version not in bounds:
+            continue
+        starts, ends = bounds[address.version]
+        i = bisect_right(starts, int(address)) - 1
+        if i >= 0 and int(address) <= ends[i]:
+            yield h["ip"], h.get("mac", ""), frozenset(h.get("open_ports", []))
+
+
+def port_states(open_ports: FrozenSet[int], ports: List[int]) -> Dict[int, str]:
+    result = dict.fromkeys(ports, "closed")
+    # Only the (few) open ports are touched, so the cost is one dict copy per host
+    for p in open_ports:
+        if p in result:
+            result[p] = "open"
+    return result
+
+
+def simulate_port_scan(host_ip: str, ports: List[int], sample_data: Dict,
+                       index: Optional[HostIndex] = None) -> Dict[int, str]:
     """
     Simulate checking ports on host_ip by comparing to sample_data "open_ports".
     Returns a mapping port -> state ("open" / "closed").
+    Pass an index from build_host_index when scanning many hosts; without one, the hosts are searched.
     """
-    # Find host entry
-    host_entry = next((h for h in sample_data.get("hosts", []) if h["ip"] == host_ip), None)
-    open_ports = set(host_entry.get("open_ports", [])) if host_entry else set()
-    result = {}
-    for p in ports:
-        result[p] = "open" if p in open_ports else "closed"
-    return result
+    if index is None:
+        host_entry = next((h for h in sample_data.get("hosts", []) if h["ip"] == host_ip), None)
+        return port_states(frozenset(host_entry.get("open_ports", [])) if host_entry else frozenset(), ports)
+    entry = index.get(host_ip)
+    return port_states(entry[1] if entry else frozenset(), ports)
+
+
+class ReportWriter:
+    """
+    Write the simulated report one host at a time instead of building it in memory.
+    "json" produces the same document as json.dump(report, indent=2); "jsonl" writes one
+    {"ip", "mac", "ports"} object per line, which is much faster to write and to consume.
+    """
+
+    def __init__(self, path: str, fmt: str = "json"):
+        if fmt not in ("json", "jsonl"):
+            raise ValueError(f"unknown report format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.count = 0
+        self._file = open(path, "w")
+
+    def write_host(self, ip: str, mac: str, ports: Dict[int, str]) -> None:
+        entry = {"mac": mac, "ports": ports}
+        if self.fmt == "jsonl":
+            self._file.write(json.dumps({"ip": ip, **entry}) + "\n")
+        else:
+            body = json.dumps(entry, indent=2).replace("\n", "\n  ")
+            self._file.write(("{\n" if not self.count else ",\n") + f"  {json.dumps(ip)}: {body}")
+        self.count += 1
+
+    def close(self) -> None:
+        if self.fmt == "json":
+            self._file.write("\n}" if self.count else "{}")
+        self._file.close()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 def pretty_print_discovery(active_hosts: List[Tuple[str, str]]) -> None:
@@ -83,41 +316,63 @@ def parse_ports(ports_str: str) -> List[int]:
 def main(argv=None):
     parser = argparse.ArgumentParser(description="Mock Recon Scanner (safe simulation)")
     parser.add_argument("--target", "-t", required=False, default="192.168.1.0/24",
-                        help="Target subnet (simulated)")
+                        help="Target subnet(s), comma-separated (e.g. 10.0.0.0/16,192.168.1.0/24) (simulated)")
     parser.add_argument("--ports", "-p", required=False,
                         help="Comma-separated list of ports or ranges (e.g. 22,80,8000-8010). If omitted a default set is used.")
     parser.add_argument("--data-file", "-d", required=False, default=DATA_FILE,
                         help="Path to sample network JSON (for simulation)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Skip per-host output and print only a summary (for large synthetic networks)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read the sample file incrementally and report hosts in file order (constant memory)")
+    parser.add_argument("--output", "-o", required=False, default=REPORT_FILE, help="Path of the report file")
+    parser.add_argument("--format", "-f", choices=("json", "jsonl"),
+                        help="Report format (default: jsonl for .jsonl output paths, json otherwise)")
     args = parser.parse_args(argv)
 
-    # load sample network
-    try:
-        sample = load_sample_network(os.path.abspath(args.data_file))
-    except FileNotFoundError:
+    data_file = os.path.abspath(args.data_file)
+    if not os.path.isfile(data_file):
         print("Sample data file not found. Please ensure data/sample_network.json exists.", file=sys.stderr)
         sys.exit(2)
 
     ports = parse_ports(args.ports) if args.ports else parse_ports(None)
+    port_set = frozenset(ports)
+    fmt = args.format or ("jsonl" if args.output.endswith(".jsonl") else "json")
+
+    started = time.perf_counter()
 
     # Simulate ARP discovery
-    active_hosts = simulate_arp_discovery(args.target, sample)
-    pretty_print_discovery(active_hosts)
+    try:
+        if args.stream:
+            parse_targets(args.target)  # fail before any output on a bad target
+            hosts = stream_arp_discovery(args.target, iter_sample_hosts(data_file))
+        else:
+            sample = load_sample_network(data_file)
+            active_hosts = simulate_arp_discovery(args.target, sample, build_address_index(sample))
+            if not args.quiet:
+                pretty_print_discovery(active_hosts)
+            index = build_host_index(sample)
+            hosts = ((ip, mac, index[ip][1] if ip in index else frozenset()) for ip, mac in active_hosts)
+    except ValueError as e:
+        print(f"Invalid target: {e}", file=sys.stderr)
+        sys.exit(2)
 
-    # Simulate port scanning each host
-    final_report = {}
-    for ip, mac in active_hosts:
-        res = simulate_port_scan(ip, ports, sample)
-        pretty_print_port_results(ip, res)
-        final_report[ip] = {
-            "mac": mac,
-            "ports": res
-        }
-
-    # Save simulated report to JSON for use in README / screenshot demonstration
-    out_path = os.path.join(os.path.dirname(__file__), "..", "simulated_report.json")
-    with open(out_path, "w") as f:
-        json.dump(final_report, f, indent=2)
-    print(f"Simulation complete. Report saved to: {out_path}\n")
+    # Simulate port scanning each host, writing each to the report as soon as it is done
+    open_count = 0
+    with ReportWriter(args.output, fmt) as report:
+        for ip, mac, open_ports in hosts:
+            res = port_states(open_ports, ports)
+            if not args.quiet:
+                if args.stream:
+                    print(f"Discovered {ip} ({mac})")
+                pretty_print_port_results(ip, res)
+            open_count += len(open_ports & port_set)
+            report.write_host(ip, mac, res)
+
+    if args.quiet:
+        print(f"Simulated {report.count} hosts x {len(ports)} ports: {open_count} open "
+              f"({time.perf_counter() - started:.2f}s)")
+    print(f"Simulation complete. Report saved to: {args.output}\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+"""
+Benchmark the mock scanner on synthetic networks of 1k, 10k and 100k hosts.
+
+Times load_sample_network, iter_sample_hosts, simulate_arp_discovery, simulate_port_scan and report
+writing (json and jsonl), and writes the results as JSON. Compare a run against the saved baseline to
+catch scaling regressions:
+
+    python tests/benchmark_mock_scanner.py --compare tests/benchmark_baseline.json
+    python tests/benchmark_mock_scanner.py --output tests/benchmark_baseline.json   # refresh the baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner import generate_network, mock_scanner  # noqa: E402
+
+SIZES = (1000, 10000, 100000)
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+TOLERANCE = 2.0
+REPEAT = 3
+# Stages faster than this at the smallest size are too noisy to judge how they scale
+MIN_SCALING_SECONDS = 0.005
+
+
+def _timed(func, repeat=REPEAT):
+    # Best of `repeat` runs, which filters out most scheduler noise
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_size(hosts, workdir, ports=None):
+    """Seconds per stage for one network size."""
+    ports = ports or mock_scanner.parse_ports(None)
+    path = os.path.join(workdir, f"network_{hosts}.json")
+    subnet = generate_network.write_network(path, hosts, seed=hosts)
+    timings = {}
+
+    timings["load_sample_network"], sample = _timed(lambda: mock_scanner.load_sample_network(path))
+    timings["iter_sample_hosts"], _ = _timed(lambda: sum(1 for _ in mock_scanner.iter_sample_hosts(path)))
+    # Index builds are timed with the stages that need them, as main would pay for them
+    timings["simulate_arp_discovery"], active = _timed(
+        lambda: mock_scanner.simulate_arp_discovery(subnet, sample, mock_scanner.build_address_index(sample)))
+
+    def scan():
+        index = mock_scanner.build_host_index(sample)
+        return [(ip, mac, mock_scanner.simulate_port_scan(ip, ports, sample, index)) for ip, mac in active]
+    timings["simulate_port_scan"], results = _timed(scan)
+
+    for fmt in ("json", "jsonl"):
+        def write():
+            with mock_scanner.ReportWriter(os.path.join(workdir, f"report_{hosts}.{fmt}"), fmt) as report:
+                for ip, mac, res in results:
+                    report.write_host(ip, mac, res)
+        timings[f"report_{fmt}"], _ = _timed(write)
+
+    assert len(active) == hosts
+    return timings
+
+
+def run(sizes=SIZES):
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {str(n): bench_size(n, workdir) for n in sizes}
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=TOLERANCE):
+    """
+    Regressions as messages: a stage slower than `tolerance` x baseline, or whose cost per host at the
+    largest size grew more than `tolerance` x relative to the smallest size (i.e. it stopped scaling
+    linearly). Stages or sizes missing from either side are ignored.
+    """
+    problems = []
+    for size, stages in current["results"].items():
+        for stage, seconds in stages.items():
+            base = baseline["results"].get(size, {}).get(stage)
+            # Sub-millisecond stages are dominated by noise
+            if base is not None and seconds > max(base * tolerance, base + 0.001):
+                problems.append(f"{stage} @ {size} hosts: {seconds:.4f}s vs baseline {base:.4f}s")
+    sizes = sorted(current["results"], key=int)
+    if len(sizes) > 1:
+        small, large = sizes[0], sizes[-1]
+        for stage, seconds in current["results"][large].items():
+            current_small = current["results"][small][stage]
+            base_small = baseline["results"].get(small, {}).get(stage)
+            base_large = baseline["results"].get(large, {}).get(stage)
+            if not base_small or not base_large or min(base_small, current_small) < MIN_SCALING_SECONDS:
+                continue
+            growth = (seconds / int(large)) / (current_small / int(small))
+            base_growth = (base_large / int(large)) / (base_small / int(small))
+            if growth > base_growth * tolerance:
+                problems.append(f"{stage}: per-host cost grows {growth:.1f}x from {small} to {large} hosts "
+                                f"(baseline {base_growth:.1f}x)")
+    return problems
+
+
+def print_table(report):
+    stages = list(next(iter(report["results"].values())))
+    print(f"{'stage':<24}" + "".join(f"{size + ' hosts':>14}" for size in report["results"]))
+    for stage in stages:
+        print(f"{stage:<24}" + "".join(f"{report['results'][size][stage]:>13.4f}s" for size in report["results"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the mock scanner at several network sizes")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="Comma-separated host counts")
+    parser.add_argument("--output", "-o", help="Write the results JSON here (e.g. the baseline file)")
+    parser.add_argument("--compare", "-c", nargs="?", const=BASELINE,
+                        help="Baseline JSON to compare against (default: tests/benchmark_baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown factor")
+    args = parser.parse_args(argv)
+
+    report = run(tuple(int(n) for n in args.sizes.split(",")))
+    print_table(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
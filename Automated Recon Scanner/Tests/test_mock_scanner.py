@@ -1,6 +1,7 @@
+import ipaddress
 import json
 import os
-from scanner import mock_scanner
+from scanner import generate_network, mock_scanner
 
 BASE = os.path.dirname(os.path.dirname(__file__))
 DATA_FILE = os.path.join(BASE, "data", "sample_network.json")
@@ -15,10 +16,31 @@ def test_load_sample_network():
 def test_simulate_arp_discovery():
     data = mock_scanner.load_sample_network(DATA_FILE)
     hosts = mock_scanner.simulate_arp_discovery("192.168.1.0/24", data)
-    assert len(hosts) == len(data["hosts"])
+    in_subnet = [h for h in data["hosts"] if h["ip"].startswith("192.168.1.")]
+    assert len(hosts) == len(in_subnet)
     for ip, mac in hosts:
         assert isinstance(ip, str)
         assert isinstance(mac, str)
+        assert ip.startswith("192.168.1.")
+
+
+def test_simulate_arp_discovery_ranges():
+    data = {"hosts": [
+        {"ip": "10.0.0.5", "mac": "A"},
+        {"ip": "192.168.1.200", "mac": "B"},
+        {"ip": "10.0.1.1", "mac": "C"},
+        {"ip": "192.168.2.1", "mac": "D"},
+        {"ip": "fe80::1", "mac": "E"},
+        {"ip": "not-an-ip", "mac": "F"},
+    ]}
+    discover = mock_scanner.simulate_arp_discovery
+    assert discover("10.0.0.0/24", data) == [("10.0.0.5", "A")]
+    # Comma-separated and overlapping ranges come back once each, in address order
+    assert discover("192.168.1.0/24, 10.0.0.0/16,10.0.0.5", data) == [
+        ("10.0.0.5", "A"), ("10.0.1.1", "C"), ("192.168.1.200", "B")]
+    assert discover("192.168.2.1", data) == [("192.168.2.1", "D")]
+    assert discover("fe80::/64", data) == [("fe80::1", "E")]
+    assert discover("172.16.0.0/12", data) == []
 
 
 def test_simulate_port_scan_known_open():
@@ -28,3 +50,94 @@ def test_simulate_port_scan_known_open():
     assert res[22] == "open"
     assert res[80] == "open"
     assert res[443] == "closed"
+
+
+def test_build_host_index():
+    data = {"hosts": [
+        {"ip": "10.0.0.1", "mac": "AA", "open_ports": [22, 80]},
+        {"ip": "10.0.0.2", "mac": "BB", "open_ports": []},
+        {"ip": "10.0.0.1", "mac": "CC", "open_ports": [443]},
+    ]}
+    index = mock_scanner.build_host_index(data)
+    assert index == {"10.0.0.1": ("AA", frozenset({22, 80})), "10.0.0.2": ("BB", frozenset())}
+
+
+def test_simulate_port_scan_with_index():
+    data = {"hosts": [{"ip": f"10.0.{i // 256}.{i % 256}", "mac": "AA", "open_ports": [i % 1000 + 1]}
+                      for i in range(5000)]}
+    index = mock_scanner.build_host_index(data)
+    ports = list(range(1, 1001))
+    res = mock_scanner.simulate_port_scan("10.0.4.10", ports, data, index)
+    assert list(res) == ports
+    assert [p for p, state in res.items() if state == "open"] == [1034 % 1000 + 1]
+    # Unknown hosts have every port closed; the unindexed lookup must match the indexed one
+    assert set(mock_scanner.simulate_port_scan("10.9.9.9", ports, data).values()) == {"closed"}
+    assert mock_scanner.simulate_port_scan("10.0.4.10", ports, data) == res
+
+
+def test_simulate_sees_in_place_edits():
+    data = {"hosts": [{"ip": "10.0.0.1", "mac": "AA", "open_ports": [22]}]}
+    assert mock_scanner.simulate_port_scan("10.0.0.1", [22, 80], data) == {22: "open", 80: "closed"}
+    assert mock_scanner.simulate_arp_discovery("10.0.0.0/24", data) == [("10.0.0.1", "AA")]
+    data["hosts"][0]["open_ports"].append(80)
+    assert mock_scanner.simulate_port_scan("10.0.0.1", [22, 80], data) == {22: "open", 80: "open"}
+    data["hosts"][0] = {"ip": "10.0.0.2", "mac": "BB", "open_ports": [443]}
+    assert mock_scanner.simulate_port_scan("10.0.0.2", [443], data) == {443: "open"}
+    assert mock_scanner.simulate_arp_discovery("10.0.0.0/24", data) == [("10.0.0.2", "BB")]
+
+
+def test_iter_sample_hosts_matches_load(monkeypatch):
+    # A tiny chunk size forces values to straddle buffer refills
+    monkeypatch.setattr(mock_scanner, "CHUNK_SIZE", 5)
+    meta = {}
+    hosts = list(mock_scanner.iter_sample_hosts(DATA_FILE, meta))
+    data = mock_scanner.load_sample_network(DATA_FILE)
+    assert hosts == data["hosts"]
+    assert meta == {k: v for k, v in data.items() if k != "hosts"}
+
+
+def test_stream_arp_discovery():
+    hosts = [{"ip": "10.0.0.5", "mac": "A", "open_ports": [22]}, {"ip": "10.1.0.1", "mac": "B"}]
+    found = list(mock_scanner.stream_arp_discovery("10.0.0.0/24,192.168.0.0/16", hosts))
+    assert found == [("10.0.0.5", "A", frozenset({22}))]
+
+
+def test_report_writer_formats(tmp_path):
+    report = {"10.0.0.1": {"mac": "AA", "ports": {22: "open", 80: "closed"}},
+              "10.0.0.2": {"mac": "BB", "ports": {22: "closed", 80: "closed"}}}
+    json_path, jsonl_path = tmp_path / "r.json", tmp_path / "r.jsonl"
+    with mock_scanner.ReportWriter(str(json_path)) as w:
+        for ip, entry in report.items():
+            w.write_host(ip, entry["mac"], entry["ports"])
+    assert json_path.read_text() == json.dumps(report, indent=2)
+    with mock_scanner.ReportWriter(str(jsonl_path), "jsonl") as w:
+        for ip, entry in report.items():
+            w.write_host(ip, entry["mac"], entry["ports"])
+    lines = [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    assert [line["ip"] for line in lines] == list(report)
+    assert lines[0]["ports"] == {"22": "open", "80": "closed"}
+
+
+def test_generate_network(tmp_path):
+    path = str(tmp_path / "net.json")
+    subnet = generate_network.write_network(path, 500, subnet="10.5.0.0/22", mean_open_ports=3, seed=7)
+    data = mock_scanner.load_sample_network(path)
+    assert data["subnet"] == subnet == "10.5.0.0/22"
+    ips = [h["ip"] for h in data["hosts"]]
+    assert len(set(ips)) == 500
+    assert all(ipaddress.ip_address(ip) in ipaddress.ip_network(subnet) for ip in ips)
+    assert all(1 <= p <= 65535 for h in data["hosts"] for p in h["open_ports"])
+    # Same seed, same network, in either output format
+    jsonl_path = str(tmp_path / "net.jsonl")
+    generate_network.write_network(jsonl_path, 500, subnet="10.5.0.0/22", mean_open_ports=3, seed=7)
+    assert list(mock_scanner.iter_sample_hosts(jsonl_path)) == data["hosts"]
+
+
+def test_benchmark_compare():
+    import benchmark_mock_scanner as bench
+    report = bench.run(sizes=(50, 100))
+    assert set(report["results"]) == {"50", "100"}
+    assert bench.compare(report, report) == []
+    slower = {"results": {size: {stage: seconds * 10 + 1 for stage, seconds in stages.items()}
+                          for size, stages in report["results"].items()}}
+    assert bench.compare(slower, report)
@@ -1,30 +1,576 @@
+import argparse
+import calendar
+import gzip
+import hashlib
+import json
+import mmap
 import os
-def analyze_logs(sample_log):
-    suspicious_count = 0
-    total_lines = 0
+import re
+import socket
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_KEYWORDS = ("DENY", "BLOCK", "FAILED")
+BLOCK_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024 * 1024
+TAIL_PROBE = 4096
+MB = 1024 * 1024
+
+INDEX_MAGIC = b"FWAGG\x00\x02\x00"
+# Each table is keyed on a few fields only, so its size follows the distinct keys, not the line count
+INDEX_TABLES = (
+    ("sources", (("hour", "I"), ("action", "B"), ("src", "I"), ("count", "Q"))),
+    ("hours", (("hour", "I"), ("action", "B"), ("count", "Q"))),
+    ("actions", (("action", "B"), ("count", "Q"))),
+    ("destinations", (("action", "B"), ("dst", "I"), ("count", "Q"))),
+    ("ports", (("action", "B"), ("port", "H"), ("count", "Q"))),
+)
+MONTHS = {name.encode(): number for number, name in enumerate(calendar.month_abbr) if name}
+TIMESTAMP_RE = re.compile(rb"\s*(?:(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):|([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}):)")
+ACTION_RE = re.compile(rb"\b(ALLOW|ACCEPT|PERMIT|DENY|DROP|BLOCK|REJECT|FAILED)\b")
+ADDRESS_RE = re.compile(rb"(?<![\d.])(\d{1,3}(?:\.\d{1,3}){3})(?::(\d{1,5}))?(?![\d.])")
+KEY_VALUE_RE = re.compile(rb"\b(SRC|DST|DPT)=(\S+)")
+
+
+def build_matcher(keywords=None):
+    # One alternation over every keyword, so each block is searched in a single pass
+    words = list(DEFAULT_KEYWORDS)
+    for word in keywords or ():
+        if word and word not in words:
+            words.append(word)
+    return re.compile(b"|".join(re.escape(word.encode("utf-8")) for word in words))
+
+
+def is_gzip(path):
+    with open(path, "rb") as f:
+        return f.read(2) == b"\x1f\x8b"
+
+
+def open_log(path):
+    # Rotated logs are often gzip-compressed; those are decompressed as a stream
+    return gzip.open(path, "rb") if is_gzip(path) else open(path, "rb")
+
+
+def iter_blocks(log_file, start=0, end=None, block_size=BLOCK_SIZE):
+    # Yield newline-aligned blocks of raw bytes from an open binary file
+    log_file.seek(start)
+    remaining = None if end is None else end - start
+    carry = b""
+    while remaining is None or remaining > 0:
+        size = block_size if remaining is None else min(block_size, remaining)
+        data = log_file.read(size)
+        if not data:
+            break
+        if remaining is not None:
+            remaining -= len(data)
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            carry += data
+            continue
+        yield carry + data[:cut] if carry else data[:cut]
+        carry = data[cut:]
+    if carry:
+        yield carry
+
+
+def iter_mmap_blocks(log_file, start=0, end=None, block_size=BLOCK_SIZE):
+    # Same as iter_blocks, but slices a read-only memory map instead of issuing reads
+    size = os.fstat(log_file.fileno()).st_size
+    end = size if end is None else min(end, size)
+    if start >= end:
+        return
+    with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        pos = start
+        while pos < end:
+            stop = min(pos + block_size, end)
+            if stop < end:
+                cut = mapped.rfind(b"\n", pos, stop)
+                if cut == -1:
+                    cut = mapped.find(b"\n", stop, end)
+                stop = end if cut == -1 else cut + 1
+            yield mapped[pos:stop]
+            pos = stop
+
+
+def scan_block(block, matcher, matches=None):
+    # Count the lines of a block and collect every line that contains a keyword
+    lines = block.count(b"\n")
+    if block and not block.endswith(b"\n"):
+        lines += 1
+    found = 0
+    pos = 0
+    search = matcher.search
+    while True:
+        hit = search(block, pos)
+        if hit is None:
+            break
+        line_start = block.rfind(b"\n", 0, hit.start()) + 1
+        line_end = block.find(b"\n", hit.end())
+        if line_end == -1:
+            line_end = len(block)
+        found += 1
+        if matches is not None:
+            matches.append(block[line_start:line_end])
+        pos = line_end + 1
+    return lines, found
+
+
+def format_matches(matches, prefix=b""):
+    # One joined payload per block keeps the sink buffered even when most lines are hits
+    return b"".join(prefix + line.strip() + b"\n" for line in matches)
+
+
+def split_offsets(path, chunk_size=CHUNK_SIZE):
+    # Byte ranges of roughly chunk_size that always end just after a newline
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as log_file:
+        start = 0
+        while start < size:
+            stop = start + chunk_size
+            if stop >= size:
+                stop = size
+            else:
+                log_file.seek(stop)
+                stop += len(log_file.readline())
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+
+def _scan_chunk(job):
+    # Worker side of the parallel mode: classify one byte range and return its formatted hits
+    path, start, end, keywords, collect, prefix, block_size, use_mmap = job
+    matcher = build_matcher(keywords)
+    total = found = 0
+    chunks = []
+    with open(path, "rb") as log_file:
+        reader = iter_mmap_blocks if use_mmap else iter_blocks
+        for block in reader(log_file, start, end, block_size):
+            matches = [] if collect else None
+            lines, hits = scan_block(block, matcher, matches)
+            total += lines
+            found += hits
+            if matches:
+                chunks.append(format_matches(matches, prefix))
+    return total, found, b"".join(chunks)
+
+
+def bounded_map(pool, func, jobs, window):
+    # Like pool.map, but keeps at most `window` jobs in flight so finished results never pile up
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.submit(func, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _scan_parallel(path, keywords, sink, prefix, block_size, use_mmap, workers, stats):
+    size = os.path.getsize(path)
+    chunk_size = max(min(CHUNK_SIZE, -(-size // workers)), block_size)
+    collect = sink is not None
+    jobs = ((path, start, end, keywords, collect, prefix, block_size, use_mmap)
+            for start, end in split_offsets(path, chunk_size))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Results come back in submission order, so hits come out exactly as in a serial run;
+        # a slow sink holds back submission instead of letting finished chunks queue up in memory
+        for total, found, payload in bounded_map(pool, _scan_chunk, jobs, workers * 2):
+            stats["total"] += total
+            stats["suspicious"] += found
+            if payload:
+                sink.write(payload)
+    stats["bytes"] = size
+
+
+def _scan_open_file(log_file, start, end, matcher, sink, prefix, block_size, use_mmap, stats):
+    reader = iter_mmap_blocks if use_mmap else iter_blocks
+    for block in reader(log_file, start, end, block_size):
+        matches = [] if sink is not None else None
+        lines, found = scan_block(block, matcher, matches)
+        stats["total"] += lines
+        stats["suspicious"] += found
+        stats["bytes"] += len(block)
+        if matches:
+            sink.write(format_matches(matches, prefix))
+
+
+def scan_log(path, keywords=None, sink=None, prefix=b"", block_size=BLOCK_SIZE, use_mmap=False, workers=1):
+    stats = {"total": 0, "suspicious": 0, "bytes": 0}
+    started = time.perf_counter()
+    compressed = is_gzip(path)
+    if workers > 1 and not compressed:
+        _scan_parallel(path, keywords, sink, prefix, block_size, use_mmap, workers, stats)
+    else:
+        with open_log(path) as log_file:
+            _scan_open_file(log_file, 0, None, build_matcher(keywords), sink, prefix, block_size,
+                            use_mmap and not compressed, stats)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def load_checkpoint(checkpoint_path):
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state if {"inode", "device", "offset", "line_hash"} <= set(state) else None
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_checkpoint(checkpoint_path, state):
+    # Write-then-rename, so a crash mid-save never leaves a half-written checkpoint behind
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def _line_hash(log_file, offset):
+    # Hash of the last complete line before offset, used to notice a file that was truncated and refilled
+    if offset == 0:
+        return ""
+    start = max(0, offset - TAIL_PROBE)
+    log_file.seek(start)
+    data = log_file.read(offset - start)
+    return hashlib.sha256(data[data.rfind(b"\n", 0, len(data) - 1) + 1:]).hexdigest()
+
+
+def _aligned_end(log_file, start, size):
+    # Offset just past the last newline at or after start; a trailing partial line is left for the next run
+    pos = size
+    while pos > start:
+        window = max(start, pos - TAIL_PROBE)
+        log_file.seek(window)
+        cut = log_file.read(pos - window).rfind(b"\n")
+        if cut != -1:
+            return window + cut + 1
+        pos = window
+    return start
+
+
+def _find_rotated(path, state):
+    # logrotate renames the live file (app.log -> app.log.1, app.log-20240101, ...); find it by inode
+    directory = os.path.dirname(os.path.abspath(path))
+    base = os.path.basename(path)
     try:
-        with open(sample_log, "r", encoding="utf-8") as file:
-            for line in file:
-                total_lines += 1
-                if "DENY" in line or "BLOCK" in line or "FAILED" in line:
-                    suspicious_count += 1
-                    print("⚠️ Suspicious Entry:", line.strip())
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name != base and entry.name.startswith(base) and entry.is_file():
+                    info = entry.stat()
+                    if (info.st_ino, info.st_dev) == (state["inode"], state["device"]):
+                        return entry.path
+    except OSError:
+        pass
+    return None
+
+
+def follow_log(path, checkpoint_path, keywords=None, sink=None, prefix=b"", block_size=BLOCK_SIZE):
+    matcher = build_matcher(keywords)
+    stats = {"total": 0, "suspicious": 0, "bytes": 0, "start": 0}
+    started = time.perf_counter()
+    state = load_checkpoint(checkpoint_path)
+    with open(path, "rb") as log_file:
+        info = os.fstat(log_file.fileno())
+        start = 0
+        if state is not None:
+            if (info.st_ino, info.st_dev) != (state["inode"], state["device"]):
+                # Rotated: drain whatever was appended to the old file before the rename
+                rotated = _find_rotated(path, state)
+                if rotated:
+                    with open(rotated, "rb") as old_file:
+                        _scan_open_file(old_file, state["offset"], None, matcher, sink, prefix, block_size,
+                                        False, stats)
+                stats["rotated"] = True
+            elif info.st_size < state["offset"] or _line_hash(log_file, state["offset"]) != state["line_hash"]:
+                stats["truncated"] = True
+            else:
+                start = state["offset"]
+        end = _aligned_end(log_file, start, info.st_size)
+        _scan_open_file(log_file, start, end, matcher, sink, prefix, block_size, False, stats)
+        save_checkpoint(checkpoint_path, {
+            "inode": info.st_ino,
+            "device": info.st_dev,
+            "offset": end,
+            "line_hash": _line_hash(log_file, end),
+        })
+    stats["start"] = start
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def _ip_to_int(address):
+    try:
+        return int.from_bytes(socket.inet_aton(address.decode("ascii")), "big")
+    except (OSError, UnicodeDecodeError):
+        return 0
+
+
+def _int_to_ip(value):
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+def parse_line(line, year=None, hours=None):
+    # -> (epoch hour, action, source IPv4, destination IPv4, port); 0 / "OTHER" when a field is missing
+    hour = 0
+    stamp = TIMESTAMP_RE.match(line)
+    if stamp:
+        key = stamp.group(0)
+        if hours is not None and key in hours:
+            hour = hours[key]
+        else:
+            if stamp.group(1):
+                parts = (int(stamp.group(1)), int(stamp.group(2)), int(stamp.group(3)), int(stamp.group(4)))
+            else:
+                parts = (year or time.gmtime().tm_year, MONTHS.get(stamp.group(5), 1), int(stamp.group(6)),
+                         int(stamp.group(7)))
+            try:
+                hour = calendar.timegm(parts + (0, 0, 0, 0, 0)) // 3600
+            except (ValueError, OverflowError):
+                hour = 0
+            if hours is not None:
+                hours[key] = hour
+
+    found = ACTION_RE.search(line)
+    action = found.group(1).decode() if found else "OTHER"
+
+    src = dst = port = 0
+    if b"SRC=" in line:
+        fields = dict(KEY_VALUE_RE.findall(line))
+        src = _ip_to_int(fields.get(b"SRC", b""))
+        dst = _ip_to_int(fields.get(b"DST", b""))
+        port = int(fields[b"DPT"]) if fields.get(b"DPT", b"").isdigit() else 0
+    else:
+        addresses = ADDRESS_RE.findall(line)
+        if addresses:
+            src = _ip_to_int(addresses[0][0])
+            port = addresses[0][1]
+            if len(addresses) > 1:
+                dst = _ip_to_int(addresses[1][0])
+                port = addresses[1][1] or port
+            port = int(port) if port else 0
+    return hour, action, src, dst, port & 0xFFFF
+
+
+def build_index(paths, year=None, block_size=BLOCK_SIZE):
+    # One pass over every log; each block is parsed, then folded into the small aggregate tables
+    tables = {name: Counter() for name, _ in INDEX_TABLES}
+    sources, hours, actions, destinations, ports = (tables[name] for name, _ in INDEX_TABLES)
+    stamps = {}
+    for path in paths:
+        with open_log(path) as log_file:
+            for block in iter_blocks(log_file, block_size=block_size):
+                parsed = Counter(parse_line(line, year, stamps) for line in block.splitlines() if line.strip())
+                for (hour, action, src, dst, port), count in parsed.items():
+                    sources[hour, action, src] += count
+                    hours[hour, action] += count
+                    actions[action,] += count
+                    destinations[action, dst] += count
+                    ports[action, port] += count
+    return tables
+
+
+def save_index(tables, index_path):
+    # Columnar layout: a header, the action names, then per table a row count and one packed array per column
+    actions = sorted(action for action, in tables["actions"])
+    action_ids = {name: number for number, name in enumerate(actions)}
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_MAGIC + struct.pack("<B", len(actions)))
+        for name in actions:
+            encoded = name.encode()
+            f.write(struct.pack("<B", len(encoded)) + encoded)
+        for table, columns in INDEX_TABLES:
+            data = [array(code) for _, code in columns]
+            for key, count in sorted(tables[table].items()):
+                for (name, _), column, value in zip(columns, data, key + (count,)):
+                    column.append(action_ids[value] if name == "action" else value)
+            f.write(struct.pack("<I", len(tables[table])))
+            for column in data:
+                if sys.byteorder == "big":
+                    column.byteswap()
+                column.tofile(f)
+    os.replace(tmp_path, index_path)
+
+
+def load_index(index_path):
+    with open(index_path, "rb") as f:
+        header = f.read(len(INDEX_MAGIC) + 1)
+        if header[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"not a firewall aggregation index (rebuild it with --build-index): {index_path}")
+        actions = [f.read(f.read(1)[0]).decode() for _ in range(header[-1])]
+        index = {"names": actions}
+        for table, columns in INDEX_TABLES:
+            rows = struct.unpack("<I", f.read(4))[0]
+            index[table] = {}
+            for name, code in columns:
+                column = array(code)
+                column.fromfile(f, rows)
+                if sys.byteorder == "big":
+                    column.byteswap()
+                index[table][name] = column
+    return index
+
+
+def event_totals(index, action=None, per_hour=False):
+    # -> total events, or {hour: events}, from the per-action and per-hour tables
+    wanted = index["names"].index(action) if action in index["names"] else None
+    if action and wanted is None:
+        return {} if per_hour else 0
+    if not per_hour:
+        table = index["actions"]
+        return sum(count for action_id, count in zip(table["action"], table["count"])
+                   if wanted is None or action_id == wanted)
+    totals = Counter()
+    table = index["hours"]
+    for hour, action_id, count in zip(table["hour"], table["action"], table["count"]):
+        if wanted is None or action_id == wanted:
+            totals[hour] += count
+    return totals
+
+
+def top_sources(index, action=None, top=10, per_hour=False):
+    # -> [(source, hits)] or {hour: [(source, hits)]}, answered from the index alone
+    wanted = index["names"].index(action) if action in index["names"] else None
+    if action and wanted is None:
+        return {} if per_hour else []
+    totals = {}
+    table = index["sources"]
+    for hour, action_id, src, count in zip(table["hour"], table["action"], table["src"], table["count"]):
+        if wanted is not None and action_id != wanted:
+            continue
+        bucket = totals.setdefault(hour if per_hour else None, Counter())
+        bucket[src] += count
+    ranked = {hour: [(_int_to_ip(src), hits) for src, hits in counts.most_common(top)]
+              for hour, counts in sorted(totals.items())}
+    return ranked if per_hour else ranked.get(None, [])
+
+
+def print_top_sources(index, action=None, top=10, per_hour=False):
+    label = action or "all"
+    result = top_sources(index, action, top, per_hour)
+    totals = event_totals(index, action, per_hour)
+    if not per_hour:
+        result = {None: result}
+    print(f"\nTop {top} source IPs ({label} events):")
+    if not per_hour:
+        print(f"  {totals} events in total")
+    for hour, ranked in result.items():
+        if per_hour:
+            when = time.strftime("%Y-%m-%d %H:00", time.gmtime(hour * 3600)) if hour else "no timestamp"
+            print(f"\n{when} ({totals[hour]} events)")
+        for src, hits in ranked:
+            print(f"  {src:<16} {hits}")
+
+
+def print_summary(stats):
+    if "start" in stats:
+        if stats.get("rotated"):
+            print("\nLog was rotated since the last run; continued from the start of the new file.")
+        elif stats.get("truncated"):
+            print("\nLog was truncated since the last run; rescanned it from the start.")
+        else:
+            print(f"\nResumed from byte offset {stats['start']}.")
+    print(f"\nTotal entries: {stats['total']}")
+    print(f"Suspicious entries: {stats['suspicious']}")
+    seconds = max(stats["seconds"], 1e-9)
+    megabytes = stats["bytes"] / MB
+    print(f"Scanned {megabytes:.1f} MB in {stats['seconds']:.2f}s ({megabytes / seconds:.1f} MB/s)")
+
+
+def analyze_logs(sample_log, keywords=None, quiet=False, output=None, use_mmap=False, block_size=BLOCK_SIZE,
+                 workers=1, checkpoint=None):
+    out_file = None
+    sink = None
+    prefix = b""
+    try:
+        if output:
+            out_file = open(output, "wb", buffering=MB)
+            sink = out_file
+        elif not quiet:
+            sys.stdout.flush()
+            sink = sys.stdout.buffer
+            prefix = "⚠️ Suspicious Entry: ".encode(sys.stdout.encoding or "utf-8", errors="replace")
+        if checkpoint and not is_gzip(sample_log):
+            stats = follow_log(sample_log, checkpoint, keywords, sink, prefix, block_size)
+        else:
+            stats = scan_log(sample_log, keywords, sink, prefix, block_size, use_mmap, workers)
     except FileNotFoundError:
         print(f"Error: log file not found: {sample_log}")
         return
     except PermissionError:
         print(f"Error: permission denied when opening: {sample_log}")
         return
+    finally:
+        if out_file is not None:
+            out_file.close()
+        elif sink is not None:
+            sink.flush()
 
-    print(f"\nTotal entries: {total_lines}")
-    print(f"Suspicious entries: {suspicious_count}")
+    print_summary(stats)
+    return stats
 
-if __name__ == "__main__":
-    print("Firewall Log Analyzer")
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    default_log = os.path.join(script_dir, "sample_log.txt")
 
-    user_input = input(f"Enter log file path (press Enter to use default: {default_log}): ").strip()
-    log_file = user_input if user_input else default_log
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Firewall Log Analyzer")
+    parser.add_argument("log", nargs="*", help="Log file(s) to analyze, plain or .gz (prompted for if omitted)")
+    parser.add_argument("-k", "--keyword", action="append", default=[],
+                        help="Extra keyword to flag, in addition to DENY/BLOCK/FAILED (repeatable)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Only print the summary, not every suspicious line")
+    parser.add_argument("-o", "--output", help="Write suspicious lines to this file instead of the console")
+    parser.add_argument("--mmap", action="store_true", help="Read the log through a memory map")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE // MB, help="Read block size in MB")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Scan newline-aligned chunks in this many processes (0 = one per CPU core)")
+    parser.add_argument("-f", "--follow", action="store_true",
+                        help="Only read what was appended since the last --follow run (tracked in a checkpoint file)")
+    parser.add_argument("--checkpoint", help="Checkpoint file for --follow (default: <log>.checkpoint)")
+    parser.add_argument("--build-index", metavar="INDEX",
+                        help="Parse the log(s) once and save per-hour/action/source aggregates to INDEX")
+    parser.add_argument("--query", metavar="INDEX", help="Answer a top-sources query from a saved INDEX")
+    parser.add_argument("--action", help="Limit --query to one action, e.g. DENY")
+    parser.add_argument("--top", type=int, default=10, help="Number of sources to list for --query")
+    parser.add_argument("--per-hour", action="store_true", help="Break --query results down by hour")
+    parser.add_argument("--year", type=int, help="Year for syslog timestamps, which omit it (default: current)")
+    args = parser.parse_args(argv)
 
-    analyze_logs(log_file)
+    if args.query:
+        print_top_sources(load_index(args.query), args.action, args.top, args.per_hour)
+        return
+
+    log_files = args.log
+    if not log_files:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        default_log = os.path.join(script_dir, "sample_log.txt")
+        user_input = input(f"Enter log file path (press Enter to use default: {default_log}): ").strip()
+        log_files = [user_input if user_input else default_log]
+    if len(log_files) > 1 and not args.build_index and (args.checkpoint or args.output):
+        parser.error("--checkpoint and --output can only be used with a single log file")
+
+    if args.build_index:
+        started = time.perf_counter()
+        tables = build_index(log_files, args.year, max(args.block_size, 1) * MB)
+        save_index(tables, args.build_index)
+        rows = ", ".join(f"{len(tables[name])} {name}" for name, _ in INDEX_TABLES)
+        print(f"Indexed {sum(tables['actions'].values())} entries into {rows} rows "
+              f"in {time.perf_counter() - started:.2f}s: {args.build_index}")
+        return
+
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    for log_file in log_files:
+        checkpoint = None
+        if args.follow or args.checkpoint:
+            checkpoint = args.checkpoint or log_file + ".checkpoint"
+        analyze_logs(log_file, args.keyword, args.quiet, args.output, args.mmap, max(args.block_size, 1) * MB,
+                     workers, checkpoint)
+
+
+if __name__ == "__main__":
+    print("Firewall Log Analyzer")
+    main()
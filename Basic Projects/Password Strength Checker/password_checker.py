@@ -1,26 +1,644 @@
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import pickle
 import re
+import string
+import struct
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 
-def check_password_strength(password):
-    strength = 0
-    if len(password) >= 8:
-        strength += 1
-    if re.search("[a-z]", password):
-        strength += 1
-    if re.search("[A-Z]", password):
-        strength += 1
-    if re.search("[0-9]", password):
-        strength += 1
-    if re.search("[@#$%^&*()_+!]", password):
-        strength += 1
-
-    if strength == 5:
-        return "Strong 💪"
-    elif strength >= 3:
-        return "Moderate ⚠️"
+LOWERCASE = frozenset(string.ascii_lowercase)
+UPPERCASE = frozenset(string.ascii_uppercase)
+DIGITS = frozenset(string.digits)
+SYMBOLS = frozenset("@#$%^&*()_+!")
+LABELS = ("Weak", "Moderate", "Strong")
+ICONS = {"Weak": "❌", "Moderate": "⚠️", "Strong": "💪"}
+BATCH_SIZE = 10000
+
+BREACH_MAGIC = b"PWBREACH"
+BREACH_FANOUT = 1 << 16
+BREACH_HEADER = len(BREACH_MAGIC) + 8 + (BREACH_FANOUT + 1) * 8
+PREFIX_SIZE = 8
+RUN_SIZE = 2_000_000
+
+# Built-in ranked dictionary (most common first); extend it with --wordlist files
+COMMON_WORDS = """
+password 123456 12345678 qwerty 123456789 12345 1234 111111 1234567 dragon 123123 baseball abc123 football monkey
+letmein 696969 shadow master 666666 qwertyuiop 123321 mustang 1234567890 michael 654321 superman 1qaz2wsx 7777777
+121212 000000 qazwsx 123qwe killer trustno1 jordan jennifer zxcvbnm asdfgh hunter buster soccer harley batman
+andrew tigger sunshine iloveyou 2000 charlie robert thomas hockey ranger daniel starwars 112233 george computer
+michelle jessica pepper 1111 zxcvbn 555555 11111111 131313 freedom 777777 pass maggie 159753 aaaaaa ginger
+princess joshua cheese amanda summer love ashley nicole chelsea matthew access yankees 987654321 dallas austin
+thunder taylor matrix william corvette hello martin heather secret merlin diamond 1234qwer hammer silver 222222
+88888888 anthony justin test bailey q1w2e3r4t5 patrick internet scooter orange 11111 golfer cookie richard
+samantha bigdog guitar jackson whatever mickey chicken sparky snoopy maverick phoenix camaro peanut morgan welcome
+falcon cowboy ferrari samsung andrea smokey steelers joseph mercedes dakota arsenal eagles melissa boomer booboo
+spider nascar monster tigers yellow xxxxxx 123123123 gateway marina diablo bulldog qwer1234 compaq purple banana
+junior hannah 123654 porsche lakers iceman money cowboys 987654 london tennis 999999 coffee scooby 0000 miller
+boston q1w2e3r4 brandon yamaha chester mother forever johnny edward 333333 oliver redsox player nikita knight
+fender barney midnight please brandy chicago badboy slayer rangers charles angel flower bigdaddy rabbit wizard
+jasper enter rachel chris steven winner adidas victoria natasha 1q2w3e4r jasmine winter prince fishing cocacola
+casper james 232323 raiders 888888 gandalf asdfasdf crystal 87654321 12344321 golden 8675309 panther lauren
+angela spanky madison winston shannon mike toyota canada sophie apples tiger 123abc pokemon qazxsw 55555 qwaszx
+muffin johnson murphy cooper jonathan david danielle 159357 jackie 123456a 789456 turtle abcd1234 scorpion
+qazwsxedc 101010 butter carlos password1 dennis slipknot qwerty123 asdf black startrek 12341234 cameron newyork
+rainbow nathan john 1212 rocket viking butthead asdfghjkl sierra peaches gemini doctor wilson sandra helpme
+qwertyui victor florida dolphin pookie captain tucker blue liverpool theman bandit dolphins maddog packers jaguar
+lovers nicholas united tiffany maxwell zzzzzz nirvana jeremy stupid monica elephant giants hotdog rosebud success
+mountain 444444 xxxxxxxx warrior 1q2w3e4r5t q1w2e3 123456q albert lucky azerty 7777 alex bond007 alexis 1111111
+samson scorpio bonnie gators benjamin voodoo driver dexter jason calvin freddy 212121 creative 12345a sydney
+asdfghjk red123 bubba passw0rd trouble gunner happy gordon legend jessie stella qwert eminem arthur apple nissan
+bear america 1qazxsw2 nothing parker 4444 rebecca qweqwe garfield 2222 102030 252525 11223344 magic apollo skippy
+kitten golf copper braves shelby godzilla beaver tomcat august buddy airborne qqqqqq brooklyn animal platinum
+phantom online xavier darkness blink182 power fish green 789456123 voyager police travis 12qwaszx heaven snowball
+lover abcdef 00000 007007 walter cricket sniper donkey willow loveme saturn therock redwings bigboy pumpkin trinity
+williams nintendo digital destiny topgun runner marvin guinness chance bubbles testing fire november minecraft
+asdf1234 lasvegas broncos cartman private celtic birdie little cassie babygirl donald beatles family 12121212
+school louise gabriel eclipse fluffy 147258369 lol123 explorer nelson flyers spencer scott lovely gibson doggie
+cherry snickers buffalo pantera metallica member carter qwertyu peter steve bronco paradise goober samuel montana
+mexico dreams michigan carolina friends magnum surfer maximus genius cool vampire lacrosse asd123 aaaa kimberly
+speedy sharon carmen 111222 kristina sammy racing sabrina horses 0987654321 qwerty1 baby stalker enigma 147147
+star poohbear 147258 simple marcus brian qweasdzxc drowssap hahaha caroline barbara dave viper drummer action
+einstein genesis hello1 scotty friend forest 010203 hotrod google vanessa spitfire badger friday alaska tester
+jester jake champion billy 147852 rock hawaii chevy walker stephen bill october gregory pamela music shorty westside
+stanley diesel courtney 242424 kevin hitman mark 12345qwert reddog frank qwe123 popcorn patricia aaaaaaaa teresa
+mozart buddha anderson paul melanie abcdefg security lucky1 lizard denise 3333 a12345 123789 stargate simpsons
+scarface eagle 123456789a thumper olivia naruto 1234554321 general cherokee a123456 vincent admin login root user
+guest default changeme welcome1 qwerty12 iloveyou1 monkey1 dragon1 football1 letmein1 pass123 admin123
+"""
+
+L33T_TABLE = str.maketrans({"4": "a", "@": "a", "8": "b", "(": "c", "3": "e", "6": "g", "1": "i", "!": "i",
+                            "|": "l", "0": "o", "$": "s", "5": "s", "+": "t", "7": "t", "2": "z"})
+KEYBOARD_ROWS = (("`1234567890-=", "~!@#$%^&*()_+", 0.0), ("qwertyuiop[]\\", "QWERTYUIOP{}|", 0.5),
+                 ("asdfghjkl;'", 'ASDFGHJKL:"', 0.75), ("zxcvbnm,./", "ZXCVBNM<>?", 1.25))
+DATE_RE = re.compile(r"(?<!\d)(?:(\d{1,2})([-/._ ]?)(\d{1,2})\2(\d{4}|\d{2})|(\d{4})([-/._ ]?)(\d{1,2})\6(\d{1,2}))(?!\d)")
+YEAR_RE = re.compile(r"(?<!\d)(19\d\d|20\d\d)(?!\d)")
+REPEAT_RE = re.compile(r"(.+?)\1+")
+REFERENCE_YEAR = 2026
+MIN_YEAR_SPACE = 20
+DEFAULT_TRIE_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "password_trie.cache")
+TRIE_FORMAT = 1
+
+
+def score_password(password):
+    # The character set is built once; each class check is then a small set test instead of a regex scan
+    chars = set(password)
+    return ((len(password) >= 8)
+            + (not chars.isdisjoint(LOWERCASE))
+            + (not chars.isdisjoint(UPPERCASE))
+            + (not chars.isdisjoint(DIGITS))
+            + (not chars.isdisjoint(SYMBOLS)))
+
+
+def rate(score):
+    if score == 5:
+        return "Strong"
+    elif score >= 3:
+        return "Moderate"
+    else:
+        return "Weak"
+
+
+def check_password_strength(password, breached=None):
+    if breached is not None and password in breached:
+        return f"Weak {ICONS['Weak']} (found in a breached/common password list)"
+    label = rate(score_password(password))
+    return f"{label} {ICONS[label]}"
+
+
+def password_prefix(password):
+    # First 8 bytes of the SHA-1, the same hash HIBP publishes, so its downloads index directly
+    return hashlib.sha1(password.encode("utf-8", errors="surrogateescape")).digest()[:PREFIX_SIZE]
+
+
+def _entry_prefix(line):
+    # A list line is either a plain password or a hex SHA-1 with an optional ":count" suffix (HIBP format);
+    # a 40-character hex string is always taken to be a hash
+    text = line.rstrip(b"\r\n")
+    digest = text.split(b":", 1)[0]
+    if len(digest) == 40:
+        try:
+            return bytes.fromhex(digest.decode("ascii"))[:PREFIX_SIZE]
+        except (UnicodeDecodeError, ValueError):
+            pass
+    return hashlib.sha1(text).digest()[:PREFIX_SIZE]
+
+
+def _write_run(prefixes):
+    prefixes.sort()
+    run = tempfile.TemporaryFile()
+    run.write(b"".join(prefixes))
+    run.seek(0)
+    return run
+
+
+def _read_run(run):
+    while True:
+        chunk = run.read(PREFIX_SIZE * 65536)
+        if not chunk:
+            return
+        for pos in range(0, len(chunk), PREFIX_SIZE):
+            yield chunk[pos:pos + PREFIX_SIZE]
+
+
+def build_breach_index(list_paths, index_path, run_size=RUN_SIZE):
+    # External sort: sorted runs of hash prefixes go to temp files and are merged into one sorted array,
+    # so lists with hundreds of millions of entries never need to fit in memory
+    runs = []
+    prefixes = []
+    for path in list_paths:
+        with open(path, "rb") as f:
+            for line in f:
+                prefixes.append(_entry_prefix(line))
+                if len(prefixes) >= run_size:
+                    runs.append(_write_run(prefixes))
+                    prefixes = []
+    if prefixes:
+        runs.append(_write_run(prefixes))
+
+    fanout = [0] * (BREACH_FANOUT + 1)
+    count = 0
+    previous = None
+    with open(index_path, "wb") as out:
+        out.write(b"\0" * BREACH_HEADER)
+        pending = []
+        for prefix in heapq.merge(*(_read_run(run) for run in runs)):
+            if prefix == previous:
+                continue
+            previous = prefix
+            pending.append(prefix)
+            fanout[(prefix[0] << 8 | prefix[1]) + 1] += 1
+            count += 1
+            if len(pending) >= 65536:
+                out.write(b"".join(pending))
+                pending = []
+        out.write(b"".join(pending))
+        for bucket in range(BREACH_FANOUT):
+            fanout[bucket + 1] += fanout[bucket]
+        out.seek(0)
+        out.write(BREACH_MAGIC + struct.pack("<Q", count) + struct.pack(f"<{BREACH_FANOUT + 1}Q", *fanout))
+    for run in runs:
+        run.close()
+    return count
+
+
+class BreachedPasswords:
+    # Memory-mapped sorted array of SHA-1 prefixes. Opening is one mmap call; a lookup reads two fan-out
+    # entries and binary-searches the ~n/65536 prefixes that share the first two bytes.
+
+    def __init__(self, index_path):
+        self._file = open(index_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(BREACH_MAGIC)] != BREACH_MAGIC:
+            self.close()
+            raise ValueError(f"not a breached-password index: {index_path}")
+        self.count = struct.unpack_from("<Q", self._map, len(BREACH_MAGIC))[0]
+
+    def __contains__(self, password):
+        prefix = password_prefix(password)
+        bucket = prefix[0] << 8 | prefix[1]
+        low, high = struct.unpack_from("<2Q", self._map, len(BREACH_MAGIC) + 8 + bucket * 8)
+        data = self._map
+        while low < high:
+            middle = (low + high) // 2
+            offset = BREACH_HEADER + middle * PREFIX_SIZE
+            probe = data[offset:offset + PREFIX_SIZE]
+            if probe < prefix:
+                low = middle + 1
+            elif probe > prefix:
+                high = middle
+            else:
+                return True
+        return False
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _keyboard_graph():
+    # key -> {adjacent key: direction}; shifted characters sit on the same key as their unshifted twin
+    positions = {}
+    for row, (plain, shifted, offset) in enumerate(KEYBOARD_ROWS):
+        for column, (key, upper) in enumerate(zip(plain, shifted)):
+            positions[key] = positions[upper] = (row, column + offset)
+    graph = {}
+    for key, (row, x) in positions.items():
+        graph[key] = {other: (other_row - row, other_x > x)
+                      for other, (other_row, other_x) in positions.items()
+                      if (other_row == row and abs(other_x - x) == 1)
+                      or (abs(other_row - row) == 1 and abs(other_x - x) <= 0.75)}
+    return graph
+
+
+KEYBOARD = _keyboard_graph()
+SHIFTED_KEYS = frozenset("".join(shifted for _, shifted, _ in KEYBOARD_ROWS))
+KEYBOARD_STARTS = sum(len(plain) for plain, _, _ in KEYBOARD_ROWS)
+KEYBOARD_DEGREE = sum(sum(other not in SHIFTED_KEYS for other in KEYBOARD[key])
+                      for plain, _, _ in KEYBOARD_ROWS for key in plain) / KEYBOARD_STARTS
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES = 50
+_TRIES = {}
+
+
+def _trie_key(wordlists):
+    # Cache key: trie format, the built-in list, and the path/size/mtime of every extra wordlist
+    parts = [str(TRIE_FORMAT), hashlib.sha256(COMMON_WORDS.encode()).hexdigest()]
+    for path in wordlists:
+        info = os.stat(path)
+        parts.append(f"{os.path.abspath(path)}:{info.st_size}:{info.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _insert_words(trie, words):
+    for rank, word in enumerate(words, 1):
+        word = word.strip().lower()
+        if len(word) < 3:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        if node.get("", rank + 1) > rank:
+            node[""] = rank
+
+
+def build_dictionary_trie(wordlists=()):
+    # Nested dicts keyed by character; the "" key of a node holds the rank of the word ending there
+    trie = {}
+    _insert_words(trie, COMMON_WORDS.split())
+    for path in wordlists:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            _insert_words(trie, f)
+    return trie
+
+
+def load_dictionary_trie(wordlists=(), cache_path=DEFAULT_TRIE_CACHE):
+    # Compiled once, then pickled; later processes only unpickle it as long as the sources are unchanged
+    key = _trie_key(wordlists)
+    if key in _TRIES:
+        return _TRIES[key]
+    trie = None
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if isinstance(cached, dict) and cached.get("key") == key:
+                trie = cached["trie"]
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            pass
+    if trie is None:
+        trie = build_dictionary_trie(wordlists)
+        if cache_path:
+            try:
+                with open(cache_path + ".tmp", "wb") as f:
+                    pickle.dump({"key": key, "trie": trie}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(cache_path + ".tmp", cache_path)
+            except OSError:
+                pass
+    _TRIES[key] = trie
+    return trie
+
+
+def _case_variations(token):
+    upper = sum(char.isupper() for char in token)
+    lower = sum(char.islower() for char in token)
+    if upper == 0:
+        return 1
+    if lower == 0 or (upper == 1 and (token[0].isupper() or token[-1].isupper())):
+        return 2
+    return sum(math.comb(upper + lower, k) for k in range(1, min(upper, lower) + 1))
+
+
+def _walk_trie(text, password, trie, matches, l33t_of=None):
+    n = len(text)
+    for i in range(n):
+        node = trie
+        for j in range(i, n):
+            node = node.get(text[j])
+            if node is None:
+                break
+            rank = node.get("")
+            if rank is None:
+                continue
+            if l33t_of is not None:
+                if text[i:j + 1] == l33t_of[i:j + 1]:
+                    continue
+                rank *= 2
+            matches.append((i, j, "dictionary", rank * _case_variations(password[i:j + 1])))
+
+
+def _keyboard_guesses(length, turns, shifted):
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * KEYBOARD_STARTS * KEYBOARD_DEGREE ** j
+    if shifted:
+        unshifted = length - shifted
+        guesses *= 2 if unshifted == 0 else sum(math.comb(length, k) for k in range(1, min(shifted, unshifted) + 1))
+    return int(guesses)
+
+
+def _keyboard_matches(password, matches):
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        j = i
+        turns = 0
+        direction = None
+        shifted = password[i] in SHIFTED_KEYS
+        while j + 1 < n:
+            step = KEYBOARD.get(password[j], {}).get(password[j + 1])
+            if step is None:
+                break
+            if step != direction:
+                turns += 1
+                direction = step
+            shifted += password[j + 1] in SHIFTED_KEYS
+            j += 1
+        if j - i >= 2:
+            matches.append((i, j, "keyboard", _keyboard_guesses(j - i + 1, turns, shifted)))
+            i = j
+        else:
+            i += 1
+
+
+def _sequence_matches(password, matches):
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        delta = ord(password[i + 1]) - ord(password[i])
+        if abs(delta) != 1:
+            i += 1
+            continue
+        j = i + 1
+        while j + 1 < n and ord(password[j + 1]) - ord(password[j]) == delta:
+            j += 1
+        if j - i >= 2:
+            first = password[i]
+            base = 4 if first in "aAzZ019" else 10 if first.isdigit() else 26
+            matches.append((i, j, "sequence", base * (j - i + 1) * (2 if delta < 0 else 1)))
+        i = j
+
+
+def _year_space(year):
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+
+def _date_matches(password, matches):
+    for found in DATE_RE.finditer(password):
+        if found.group(1):
+            first, second, year = int(found.group(1)), int(found.group(3)), found.group(4)
+            separator = found.group(2)
+            year = int(year) if len(year) == 4 else int(year) + (1900 if int(year) > 50 else 2000)
+        else:
+            year, first, second = int(found.group(5)), int(found.group(7)), int(found.group(8))
+            separator = found.group(6)
+        if not (1000 <= year <= 2050 and 1 <= min(first, second) and min(first, second) <= 12
+                and max(first, second) <= 31):
+            continue
+        guesses = _year_space(year) * 365 * (4 if separator else 1)
+        matches.append((found.start(), found.end() - 1, "date", guesses))
+    for found in YEAR_RE.finditer(password):
+        matches.append((found.start(), found.end() - 1, "year", _year_space(int(found.group(1)))))
+
+
+def _repeat_matches(password, trie, matches):
+    for found in REPEAT_RE.finditer(password):
+        base = found.group(1)
+        repeats = len(found.group(0)) // len(base)
+        base_guesses = _most_guessable(base, trie)[0] if len(base) > 1 else BRUTEFORCE_CARDINALITY
+        matches.append((found.start(), found.end() - 1, "repeat", base_guesses * repeats))
+
+
+def _most_guessable(password, trie):
+    # Cheapest way to cover the password with pattern matches and brute-forced characters:
+    # best[k] is the minimum guess count for password[:k]
+    n = len(password)
+    matches = []
+    lower = password.lower()
+    _walk_trie(lower, password, trie, matches)
+    unleet = lower.translate(L33T_TABLE)
+    if unleet != lower:
+        _walk_trie(unleet, password, trie, matches, lower)
+    _keyboard_matches(password, matches)
+    _sequence_matches(password, matches)
+    _date_matches(password, matches)
+    _repeat_matches(password, trie, matches)
+
+    ending = [[] for _ in range(n)]
+    for match in matches:
+        ending[match[1]].append(match)
+    best = [1] * (n + 1)
+    back = [None] * (n + 1)
+    for k in range(1, n + 1):
+        best[k] = best[k - 1] * BRUTEFORCE_CARDINALITY
+        for i, j, pattern, guesses in ending[k - 1]:
+            candidate = best[i] * max(guesses, MIN_GUESSES)
+            if candidate < best[k]:
+                best[k] = candidate
+                back[k] = (i, pattern)
+    return best[n], back
+
+
+def estimate_guesses(password, trie=None, explain=False):
+    # zxcvbn-style estimate: dictionary words (with l33t and capitalisation), keyboard walks, sequences,
+    # dates/years and repeats; uncovered characters are brute-forced at 10 guesses each
+    if trie is None:
+        trie = load_dictionary_trie()
+    guesses, back = _most_guessable(password, trie) if password else (1, [None])
+    log10 = math.log10(guesses)
+    result = {"guesses": guesses, "guesses_log10": log10,
+              "score": sum(log10 > threshold for threshold in (3, 6, 8, 10))}
+    if explain:
+        sequence = []
+        k = len(password)
+        while k > 0:
+            if back[k] is None:
+                start = k - 1
+                while start > 0 and back[start] is None:
+                    start -= 1
+                sequence.append(("bruteforce", password[start:k]))
+                k = start
+            else:
+                start, pattern = back[k]
+                sequence.append((pattern, password[start:k]))
+                k = start
+        result["sequence"] = sequence[::-1]
+    return result
+
+
+def iter_passwords(path):
+    # One candidate per line, "-" for stdin; undecodable bytes survive as surrogate escapes
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        for raw in stream:
+            yield raw.rstrip(b"\r\n").decode("utf-8", errors="surrogateescape")
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+
+def iter_batches(items, size=BATCH_SIZE):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+_breached = None
+_trie = None
+
+
+def _init_worker(index_path=None, wordlists=None, trie_cache=DEFAULT_TRIE_CACHE):
+    # Pool initializer: every worker maps the breach index and loads the cached trie once, then reuses them
+    global _breached, _trie
+    _breached = BreachedPasswords(index_path) if index_path else None
+    _trie = load_dictionary_trie(wordlists, trie_cache) if wordlists is not None else None
+
+
+def rate_batch(passwords):
+    # -> (scores, breached flags, guess estimates); the last two are None when not enabled
+    scores = [score_password(password) for password in passwords]
+    breached = None if _breached is None else [password in _breached for password in passwords]
+    estimates = None if _trie is None else [estimate_guesses(password, _trie) for password in passwords]
+    return scores, breached, estimates
+
+
+def bounded_map(pool, func, batches, window):
+    # Like pool.map, but keeps at most `window` batches in flight so huge inputs stream through
+    pending = deque()
+    for batch in batches:
+        pending.append((batch, pool.submit(func, batch)))
+        if len(pending) >= window:
+            batch, future = pending.popleft()
+            yield batch, future.result()
+    while pending:
+        batch, future = pending.popleft()
+        yield batch, future.result()
+
+
+def audit_passwords(path, output=None, workers=1, batch_size=BATCH_SIZE, breach_index=None, wordlists=None,
+                    trie_cache=DEFAULT_TRIE_CACHE):
+    # wordlists=None skips the guess estimator; pass () to estimate with the built-in dictionary only
+    histogram = Counter({label: 0 for label in LABELS})
+    started = time.perf_counter()
+    out = open(output, "w", encoding="utf-8", buffering=1024 * 1024) if output else None
+    init_args = (breach_index, wordlists, trie_cache)
+    if workers > 1:
+        if wordlists is not None:
+            load_dictionary_trie(wordlists, trie_cache)  # build the cache once, before the workers load it
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args)
     else:
-        return "Weak ❌"
+        pool = None
+        _init_worker(*init_args)
+    try:
+        batches = iter_batches(iter_passwords(path), batch_size)
+        if pool:
+            results = bounded_map(pool, rate_batch, batches, workers * 4)
+        else:
+            results = ((batch, rate_batch(batch)) for batch in batches)
+        for batch, (scores, breached, estimates) in results:
+            if breached is None:
+                labels = [rate(score) for score in scores]
+            else:
+                labels = ["Weak" if flagged else rate(score) for score, flagged in zip(scores, breached)]
+                histogram["Breached"] += sum(breached)
+            if estimates is not None:
+                histogram.update(f"guess score {estimate['score']}" for estimate in estimates)
+            histogram.update(labels)
+            if out:
+                records = ({"password": password, "strength": label, "score": score}
+                           for password, label, score in zip(batch, labels, scores))
+                if breached is not None:
+                    records = (dict(record, breached=flagged) for record, flagged in zip(records, breached))
+                if estimates is not None:
+                    records = (dict(record, guesses_log10=round(estimate["guesses_log10"], 2),
+                                    guess_score=estimate["score"])
+                               for record, estimate in zip(records, estimates))
+                out.write("".join(json.dumps(record) + "\n" for record in records))
+    finally:
+        if pool:
+            pool.shutdown()
+        if out:
+            out.close()
+    seconds = time.perf_counter() - started
+    return histogram, seconds
+
+
+def print_audit(histogram, seconds):
+    total = sum(histogram[label] for label in LABELS)
+    print(f"\nAudited {total} passwords in {seconds:.2f}s ({total / max(seconds, 1e-9):,.0f} passwords/s)")
+    for label in LABELS:
+        share = histogram[label] / total * 100 if total else 0.0
+        print(f"  {label:<9} {histogram[label]:>10}  {share:5.1f}%  {ICONS[label]}")
+    if "Breached" in histogram:
+        print(f"  ({histogram['Breached']} of the Weak results were found in the breached-password index)")
+    if any(key.startswith("guess score") for key in histogram):
+        print("Estimated guess score (0 = under 10^3 guesses ... 4 = over 10^10):")
+        for score in range(5):
+            print(f"  {score}: {histogram[f'guess score {score}']:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Password Strength Checker")
+    parser.add_argument("-f", "--file", help="Audit every password in this file, one per line ('-' for stdin)")
+    parser.add_argument("-o", "--jsonl", help="Write one JSON result per password to this file")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Score batches in this many processes (0 = one per CPU core)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Passwords per worker batch")
+    parser.add_argument("-b", "--breached", metavar="INDEX",
+                        help="Rate passwords found in this breached-password index as Weak")
+    parser.add_argument("--build-breached", nargs="+", metavar="LIST",
+                        help="Build the --breached INDEX from password lists (plain text or SHA-1[:count] lines)")
+    parser.add_argument("-e", "--estimate", action="store_true",
+                        help="Also estimate guess counts from dictionary words, keyboard walks, dates and repeats")
+    parser.add_argument("-w", "--wordlist", action="append", default=[],
+                        help="Extra ranked dictionary for --estimate, most common first (repeatable)")
+    parser.add_argument("--trie-cache", default=DEFAULT_TRIE_CACHE,
+                        help="Where the compiled dictionary trie is cached ('' disables the cache)")
+    args = parser.parse_args(argv)
+
+    if args.build_breached:
+        if not args.breached:
+            parser.error("--build-breached needs --breached INDEX as the output path")
+        started = time.perf_counter()
+        count = build_breach_index(args.build_breached, args.breached)
+        print(f"Indexed {count} unique entries in {time.perf_counter() - started:.1f}s: {args.breached}")
+        return
+
+    if not args.file:
+        breached = BreachedPasswords(args.breached) if args.breached else None
+        password = input("Enter your password: ")
+        print("Your password strength is:", check_password_strength(password, breached))
+        if args.estimate:
+            estimate = estimate_guesses(password, load_dictionary_trie(args.wordlist, args.trie_cache), explain=True)
+            print(f"Estimated guesses: about 10^{estimate['guesses_log10']:.1f} (score {estimate['score']}/4)")
+            for pattern, token in estimate["sequence"]:
+                print(f"  {pattern:<11} {token}")
+        return
+
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    wordlists = args.wordlist if args.estimate else None
+    histogram, seconds = audit_passwords(args.file, args.jsonl, workers, max(args.batch_size, 1), args.breached,
+                                         wordlists, args.trie_cache)
+    print_audit(histogram, seconds)
+
 
 if __name__ == "__main__":
     print("Password Strength Checker")
-    password = input("Enter your password: ")
-    print("Your password strength is:", check_password_strength(password))
+    main()
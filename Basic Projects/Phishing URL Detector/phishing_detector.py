@@ -1,22 +1,474 @@
+import argparse
+import json
+import mmap
+import os
+import random
 import re
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
 
-def check_url(url):
-    suspicious_patterns = [
-        r"https?://\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", 
-        r"(?i)login|verify|update|free|bonus|secure|account|webscr|ebayisapi|signin", 
-        r"https?://[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+/[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+",
-        r"bit\.ly|goo\.gl|tinyurl\.com|ow\.ly|t\.co", 
-        r"^(?!https?://[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+)", 
-    ]
-    for pattern in suspicious_patterns:
-        if re.search(pattern, url.lower()):
-            return "⚠️ Suspicious URL Detected!"
+# (rule id, pattern) in priority order; URLs are lowercased before matching
+RULES = (
+    ("ip-host", r"https?://\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}"),
+    ("keyword", r"login|verify|update|free|bonus|secure|account|webscr|ebayisapi|signin"),
+    ("deep-host-file", r"https?://[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+/[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+"),
+    ("shortener", None),  # host rule, checked against SHORTENER_DOMAINS
+    ("no-domain", r"^(?!https?://[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+)"),
+)
+COMPILED_RULES = tuple((rule_id, re.compile(pattern) if pattern else None) for rule_id, pattern in RULES)
+PATTERN_RULES = tuple((rule_id, pattern) for rule_id, pattern in COMPILED_RULES if pattern)
+RULE_ORDER = {rule_id: position for position, (rule_id, _) in enumerate(RULES)}
+# All pattern rules merged into one: a single scan clears the (usual) safe URL
+ANY_RULE = re.compile("|".join(f"(?:{pattern})" for _, pattern in RULES if pattern))
+SHORTENER_DOMAINS = frozenset({"bit.ly", "goo.gl", "tinyurl.com", "ow.ly", "t.co", "is.gd", "buff.ly", "tiny.cc",
+                               "cutt.ly", "rebrand.ly", "shorturl.at"})
+BATCH_SIZE = 5000
+
+REPUTATION_MAGIC = b"DOMREP\x00\x01"
+REPUTATION_HEADER = len(REPUTATION_MAGIC) + 24
+FINGERPRINT_TOP = 1 << 63
+CACHE_SIZE = 100000
+HOST_RE = re.compile(r"(?:[a-z][a-z0-9+.-]*://)?(?:[^/?#@]*@)?(\[[^\]/?#]*\]?|[^/?#:]*)")
+ALLOW, BLOCK = 1, 0
+
+
+def host_of(url):
+    # Lowercased host without scheme, userinfo, port or trailing dot; also works for scheme-less URLs
+    host = HOST_RE.match(url.strip().lower()).group(1)
+    if host.startswith("["):
+        return host.strip("[]")
+    return host.rstrip(".")
+
+
+def _suffixes(host):
+    # a.b.example.com -> a.b.example.com, b.example.com, example.com, com
+    suffixes = [host]
+    dot = host.find(".")
+    while dot != -1:
+        suffixes.append(host[dot + 1:])
+        dot = host.find(".", dot + 1)
+    return suffixes
+
+
+def _fingerprint(domain):
+    # 64-bit hash with the top bit set, so an occupied slot is never 0; the low bit is left for the list kind
+    digest = blake2b(domain.encode("utf-8", errors="ignore"), digest_size=8).digest()
+    return (int.from_bytes(digest, "little") | FINGERPRINT_TOP) & ~1
+
+
+def _read_domains(path):
+    # Plain domain lists, hosts-file lines ("0.0.0.0 evil.com") and "*.evil.com" wildcards; "#" starts a comment
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            fields = line.split("#", 1)[0].split()
+            if fields:
+                domain = fields[-1].lower().lstrip("*.").rstrip(".")
+                if domain:
+                    yield domain
+
+
+def build_reputation_index(blocklists, allowlists, index_path):
+    # Open-addressing hash table of domain fingerprints, written as one flat array of 8-byte slots;
+    # a domain on both lists is allowed
+    entries = {}
+    label_counts = 0
+    for path in blocklists:
+        for domain in _read_domains(path):
+            entries.setdefault(_fingerprint(domain), BLOCK)
+            label_counts |= 1 << min(domain.count(".") + 1, 63)
+    for path in allowlists:
+        for domain in _read_domains(path):
+            entries[_fingerprint(domain)] = ALLOW
+            label_counts |= 1 << min(domain.count(".") + 1, 63)
+    capacity = 16
+    while capacity < len(entries) * 2:
+        capacity *= 2
+    mask = capacity - 1
+    slots = array("Q", bytes(8 * capacity))
+    for fingerprint, kind in entries.items():
+        slot = (fingerprint >> 1) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = fingerprint | kind
+    if sys.byteorder == "big":
+        slots.byteswap()
+    with open(index_path, "wb") as f:
+        f.write(REPUTATION_MAGIC + struct.pack("<QQQ", capacity, len(entries), label_counts))
+        slots.tofile(f)
+    return len(entries)
+
+
+class DomainReputation:
+    # Memory-mapped block/allow table built by build_reputation_index. Opening only maps the file; a lookup
+    # probes one slot run per label suffix, so it costs O(label count) regardless of the list size.
+    # Suffix lengths that no listed domain has (often the bare TLD) are not probed at all.
+
+    def __init__(self, index_path):
+        self._file = open(index_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(REPUTATION_MAGIC)] != REPUTATION_MAGIC:
+            self.close()
+            raise ValueError(f"not a domain reputation index: {index_path}")
+        capacity, self.count, self._label_counts = struct.unpack_from("<QQQ", self._map, len(REPUTATION_MAGIC))
+        self._mask = capacity - 1
+        # Slots are little-endian; on such hosts index them directly instead of unpacking each one
+        self._slots = None
+        if sys.byteorder == "little":
+            self._slots = memoryview(self._map)[REPUTATION_HEADER:].cast("Q")
+
+    def _slot(self, slot):
+        if self._slots is not None:
+            return self._slots[slot]
+        return struct.unpack_from("<Q", self._map, REPUTATION_HEADER + slot * 8)[0]
+
+    def _probe(self, domain):
+        fingerprint = _fingerprint(domain)
+        slot = (fingerprint >> 1) & self._mask
+        while True:
+            value = self._slot(slot)
+            if value == 0:
+                return None
+            if value & ~1 == fingerprint:
+                return value & 1
+            slot = (slot + 1) & self._mask
+
+    def lookup(self, host):
+        # "allow" / "block" from the most specific listed suffix of host, or None if nothing is listed
+        suffixes = _suffixes(host)
+        labels = len(suffixes)
+        for suffix in suffixes:
+            if self._label_counts >> min(labels, 63) & 1:
+                kind = self._probe(suffix)
+                if kind is not None:
+                    return "allow" if kind == ALLOW else "block"
+            labels -= 1
+        return None
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self._slots is not None:
+            self._slots.release()
+        self._map.close()
+        self._file.close()
+
+
+class LruCache:
+    # Bounded LRU map with an optional time-to-live and hit/miss/eviction/expiration counters for sizing
+
+    MISSING = object()
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        entry = self._entries.get(key, self.MISSING)
+        if entry is self.MISSING:
+            self.misses += 1
+            return self.MISSING
+        value, expires = entry
+        if expires is not None and expires < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return self.MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl if self.ttl else None)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def counters(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "expirations": self.expirations, "size": len(self._entries)}
+
+
+class VerdictCache:
+    # Host-level verdicts (reputation lists, shorteners) and path-level verdicts (URL patterns) are cached
+    # separately: one host entry (keyed by host_of, so case, port and userinfo variants share it) serves every
+    # URL on that host, while URL entries are keyed by the lowercased URL the patterns actually see
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=None):
+        self.hosts = LruCache(maxsize, ttl)
+        self.urls = LruCache(maxsize, ttl)
+
+    def counters(self):
+        return {"hosts": self.hosts.counters(), "urls": self.urls.counters()}
+
+
+def _host_verdict(host, reputation=None):
+    # "allow" / "blocklist" from the reputation index, else "shortener" or None
+    if reputation is not None:
+        verdict = reputation.lookup(host)
+        if verdict is not None:
+            return "allow" if verdict == "allow" else "blocklist"
+    if not SHORTENER_DOMAINS.isdisjoint(_suffixes(host)):
+        return "shortener"
+    return None
+
+
+def _pattern_verdict(url):
+    if ANY_RULE.search(url) is None:
+        return None
+    for rule_id, pattern in PATTERN_RULES:
+        if pattern.search(url):
+            return rule_id
+    return None
+
+
+def classify_url(url, reputation=None, cache=None):
+    # -> id of the first rule (in RULES order) that matches, or None for a safe URL;
+    # with a reputation index, allowlisted hosts are safe and blocklisted ones report "blocklist".
+    # The cache never changes a verdict: each level is keyed on exactly what its rules look at.
+    url = url.lower()
+    host = host_of(url)
+    if cache is None:
+        host_rule = _host_verdict(host, reputation)
+    else:
+        host_rule = cache.hosts.get(host)
+        if host_rule is LruCache.MISSING:
+            host_rule = _host_verdict(host, reputation)
+            cache.hosts.put(host, host_rule)
+    if host_rule == "allow":
+        return None
+    if host_rule == "blocklist":
+        return host_rule
+
+    if cache is None:
+        path_rule = _pattern_verdict(url)
+    else:
+        path_rule = cache.urls.get(url)
+        if path_rule is LruCache.MISSING:
+            path_rule = _pattern_verdict(url)
+            cache.urls.put(url, path_rule)
+    if host_rule and path_rule:
+        return min(host_rule, path_rule, key=RULE_ORDER.get)
+    return host_rule or path_rule
+
+
+def check_url(url, reputation=None, cache=None):
+    if classify_url(url, reputation, cache):
+        return "⚠️ Suspicious URL Detected!"
     return "✅ URL looks safe."
 
+
+_reputation = None
+_cache = None
+
+
+def _init_worker(index_path=None, cache_size=CACHE_SIZE, cache_ttl=None):
+    # Pool initializer: each worker maps the reputation index once and keeps its own verdict cache
+    global _reputation, _cache
+    _reputation = DomainReputation(index_path) if index_path else None
+    _cache = VerdictCache(cache_size, cache_ttl) if cache_size > 0 else None
+
+
+def _counter_delta(before, after):
+    return Counter({f"{level} {name}": after[level][name] - before[level][name]
+                    for level in after for name in after[level] if name != "size"})
+
+
+def classify_batch(urls):
+    # -> (rule ids, cache counter changes during this batch or None without a cache)
+    if _cache is None:
+        return [classify_url(url, _reputation) for url in urls], None
+    before = _cache.counters()
+    verdicts = [classify_url(url, _reputation, _cache) for url in urls]
+    return verdicts, _counter_delta(before, _cache.counters())
+
+
+def iter_urls(paths):
+    # One URL per line from each file, "-" for stdin; blank lines are skipped
+    for path in paths:
+        stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", errors="replace")
+        try:
+            for line in stream:
+                url = line.strip()
+                if url:
+                    yield url
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def iter_batches(items, size=BATCH_SIZE):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bounded_map(pool, func, batches, window):
+    # Like pool.map, but keeps at most `window` batches in flight so huge inputs stream through
+    pending = deque()
+    for batch in batches:
+        pending.append((batch, pool.submit(func, batch)))
+        if len(pending) >= window:
+            batch, future = pending.popleft()
+            yield batch, future.result()
+    while pending:
+        batch, future = pending.popleft()
+        yield batch, future.result()
+
+
+def classify_stream(paths, output=None, workers=1, batch_size=BATCH_SIZE, reputation_index=None,
+                    cache_size=CACHE_SIZE, cache_ttl=None):
+    rules = Counter()
+    cache_counters = Counter()
+    total = 0
+    started = time.perf_counter()
+    out = None
+    if output == "-":
+        out = sys.stdout
+    elif output:
+        out = open(output, "w", encoding="utf-8", buffering=1024 * 1024)
+    init_args = (reputation_index, cache_size, cache_ttl)
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args)
+    else:
+        pool = None
+        _init_worker(*init_args)
+    try:
+        batches = iter_batches(iter_urls(paths), batch_size)
+        if pool:
+            results = bounded_map(pool, classify_batch, batches, workers * 4)
+        else:
+            results = ((batch, classify_batch(batch)) for batch in batches)
+        for batch, (verdicts, counters) in results:
+            total += len(batch)
+            if counters:
+                cache_counters.update(counters)
+            rules.update(rule for rule in verdicts if rule)
+            if out:
+                out.write("".join(
+                    json.dumps({"url": url, "verdict": "suspicious" if rule else "safe", "rule": rule}) + "\n"
+                    for url, rule in zip(batch, verdicts)))
+    finally:
+        if pool:
+            pool.shutdown()
+        if out and out is not sys.stdout:
+            out.close()
+    return total, rules, time.perf_counter() - started, cache_counters
+
+
+def print_stats(total, rules, seconds, cache_counters=None, stream=sys.stdout):
+    suspicious = sum(rules.values())
+    print(f"\nClassified {total} URLs in {seconds:.2f}s ({total / max(seconds, 1e-9):,.0f} URLs/s)", file=stream)
+    print(f"Suspicious: {suspicious}  Safe: {total - suspicious}", file=stream)
+    for rule_id in [rule_id for rule_id, _ in RULES] + ["blocklist"]:
+        if rules[rule_id]:
+            print(f"  {rule_id:<15} {rules[rule_id]}", file=stream)
+    if cache_counters:
+        for level in ("hosts", "urls"):
+            hits, misses = cache_counters[f"{level} hits"], cache_counters[f"{level} misses"]
+            rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+            print(f"Verdict cache ({level}): {hits} hits, {misses} misses, "
+                  f"{cache_counters[f'{level} evictions']} evictions, "
+                  f"{cache_counters[f'{level} expirations']} expirations ({rate:.1f}% hit rate)", file=stream)
+
+
+def synthetic_urls(count, seed=1):
+    # Proxy-log-like mix: mostly ordinary sites, some phishing-looking and shortened links
+    rng = random.Random(seed)
+    hosts = ["www.example.com", "news.example.org", "cdn.static.net", "mail.google.com", "docs.python.org",
+             "shop.store.co.uk", "api.service.io"]
+    paths = ["", "/", "/index.html", "/search?q=weather", "/assets/app.js", "/img/logo.png", "/a/b/c/d"]
+    odd = ["http://192.168.4.20/paypal/", "https://secure-login.example.net/verify", "http://bit.ly/3xYz",
+           "www.no-scheme.com/page", "https://free-bonus.win/claim"]
+    urls = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            urls.append(rng.choice(odd))
+        else:
+            urls.append(f"https://{rng.choice(hosts)}{rng.choice(paths)}")
+    return urls
+
+
+def run_benchmark(count, workers=1, batch_size=BATCH_SIZE, reputation_index=None, cache_size=CACHE_SIZE,
+                  cache_ttl=None):
+    urls = synthetic_urls(count)
+    init_args = (reputation_index, cache_size, cache_ttl)
+    started = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            for _ in bounded_map(pool, classify_batch, iter_batches(urls, batch_size), workers * 4):
+                pass
+    else:
+        _init_worker(*init_args)
+        for batch in iter_batches(urls, batch_size):
+            classify_batch(batch)
+    seconds = time.perf_counter() - started
+    cache = f"cache of {cache_size}" if cache_size > 0 else "no cache"
+    print(f"Benchmark: {count} URLs, {workers} worker(s), {cache}: {seconds:.2f}s "
+          f"({count / max(seconds, 1e-9):,.0f} URLs/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phishing URL Detector")
+    parser.add_argument("files", nargs="*", help="Files with one URL per line ('-' for stdin); interactive if omitted")
+    parser.add_argument("-o", "--output", help="Write one JSON verdict per URL to this file ('-' for stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Classify batches in this many processes (0 = one per CPU core)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="URLs per worker batch")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Time classification of N synthetic URLs")
+    parser.add_argument("-r", "--reputation", metavar="INDEX",
+                        help="Domain reputation index: blocklisted hosts are flagged, allowlisted ones pass")
+    parser.add_argument("--build-reputation", action="store_true",
+                        help="Build the --reputation INDEX from --blocklist/--allowlist files, then exit")
+    parser.add_argument("--blocklist", action="append", default=[], help="Blocklisted domains file (repeatable)")
+    parser.add_argument("--allowlist", action="append", default=[], help="Allowlisted domains file (repeatable)")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE,
+                        help="Entries per verdict cache, hosts and URLs each (0 disables caching)")
+    parser.add_argument("--cache-ttl", type=float, help="Seconds before a cached verdict is recomputed")
+    args = parser.parse_args(argv)
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+
+    if args.build_reputation:
+        if not args.reputation:
+            parser.error("--build-reputation needs --reputation INDEX as the output path")
+        started = time.perf_counter()
+        count = build_reputation_index(args.blocklist, args.allowlist, args.reputation)
+        print(f"Indexed {count} domains in {time.perf_counter() - started:.1f}s: {args.reputation}")
+        return
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, workers, max(args.batch_size, 1), args.reputation, args.cache_size,
+                      args.cache_ttl)
+        return
+
+    if not args.files:
+        reputation = DomainReputation(args.reputation) if args.reputation else None
+        print("Phishing URL Detector")
+        while True:
+            user_url = input("Enter a URL to check (or 'q' to quit): ")
+            if user_url.lower() == 'q':
+                break
+            print(check_url(user_url, reputation))
+        return
+
+    total, rules, seconds, cache_counters = classify_stream(args.files, args.output, workers, max(args.batch_size, 1),
+                                                            args.reputation, args.cache_size, args.cache_ttl)
+    # Keep stdout clean for the JSONL stream when it is the output
+    print_stats(total, rules, seconds, cache_counters, sys.stderr if args.output == "-" else sys.stdout)
+
+
 if __name__ == "__main__":
-    print("Phishing URL Detector")
-    while True:
-        user_url = input("Enter a URL to check (or 'q' to quit): ")
-        if user_url.lower() == 'q':
-            break
-        print(check_url(user_url))
+    main()
@@ -0,0 +1,32 @@
+import phishing_detector
+
+EDGE_CASES = [
+    "http://example.com/page#login",
+    "https://a.b.c//x.y",
+    "https://a.b.c:443/x.y",
+    "https://a.b.c/./x.y",
+    "HTTPS://WWW.Example.COM:443/Index.html",
+    "https://www.example.com/a/../verify",
+    "http://user@bit.ly:80/abc",
+    "  www.no-scheme.com/page  ",
+    "http://192.168.4.20:80/",
+]
+
+
+def test_cache_does_not_change_verdicts():
+    urls = phishing_detector.synthetic_urls(5000) + EDGE_CASES * 3
+    cache = phishing_detector.VerdictCache(maxsize=64)
+    uncached = [phishing_detector.classify_url(url) for url in urls]
+    cached = [phishing_detector.classify_url(url, cache=cache) for url in urls]
+    assert cached == uncached
+    assert cache.urls.hits and cache.hosts.hits
+
+
+def test_cache_edge_cases():
+    cache = phishing_detector.VerdictCache()
+    assert phishing_detector.classify_url("http://example.com/page#login", cache=cache) == "keyword"
+    assert phishing_detector.classify_url("https://a.b.c//x.y", cache=cache) is None
+    # Port variants share the host entry but not the URL entry
+    phishing_detector.classify_url("https://a.b.c:443//x.y", cache=cache)
+    assert cache.hosts.counters()["size"] == 2
+    assert cache.urls.counters()["size"] == 3
@@ -1,17 +1,604 @@
+import argparse
+import asyncio
+import errno
+import heapq
+import ipaddress
+import json
+import mmap
+import os
 import socket
+import sys
+import time
+from collections import Counter, deque
 
-def scan_ports(target, ports=[21, 22, 80, 443, 8080]):
-    print(f"\n🔍 Scanning target: {target}")
-    for port in ports:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        socket.setdefaulttimeout(1)
-        result = s.connect_ex((target, port))
-        if result == 0:
-            print(f"✅ Port {port} is OPEN")
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+COMMON_PORTS = [21, 22, 80, 443, 8080]
+CONCURRENCY = 500
+TIMEOUT = 1.0
+MIN_TIMEOUT = 0.1
+MAX_TIMEOUT = 10.0
+RETRIES = 2
+HOST_GROUP = 64
+SYNC_EVERY = 5000
+SYNC_SECONDS = 5.0
+FD_RESERVE = 32  # descriptors left for stdio, job files and the event loop itself
+# Errors that mean the port answered "no" (an RST or an ICMP unreachable); anything else is a local failure
+CLOSED_ERRNOS = {errno.ECONNREFUSED, errno.EHOSTUNREACH, errno.ENETUNREACH}
+
+
+def parse_ports(spec):
+    # "22,80,8000-8100" -> sorted unique port list
+    ports = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        low, high = int(low), int(high or low)
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"invalid port range: {part}")
+        ports.update(range(low, high + 1))
+    return sorted(ports)
+
+
+def iter_targets(specs):
+    # Hostnames and addresses pass through; CIDR blocks expand lazily, so a /16 never sits in memory
+    for spec in specs:
+        for item in spec.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if "/" in item:
+                network = ipaddress.ip_network(item, strict=False)
+                hosts = network.hosts() if network.num_addresses > 2 else iter(network)
+                for address in hosts:
+                    yield str(address)
+            else:
+                yield item
+
+
+def count_targets(specs):
+    # Same count iter_targets would yield, without expanding any CIDR block
+    total = 0
+    for spec in specs:
+        for item in spec.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if "/" in item:
+                network = ipaddress.ip_network(item, strict=False)
+                total += network.num_addresses
+                # hosts() drops the network and broadcast addresses of IPv4 networks larger than /31,
+                # but only the Subnet-Router anycast address of IPv6 networks larger than /127
+                if network.num_addresses > 2:
+                    total -= 2 if network.version == 4 else 1
+            else:
+                total += 1
+    return total
+
+
+def max_concurrency(concurrency):
+    # Every probe holds a socket, so concurrency must stay below the open-file limit; the soft limit is
+    # raised toward the hard one when that is allowed
+    if resource is None:
+        return concurrency
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = concurrency + FD_RESERVE
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        raised = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (raised, hard))
+            soft = raised
+        except (ValueError, OSError):
+            pass
+    if soft == resource.RLIM_INFINITY:
+        return concurrency
+    return max(min(concurrency, soft - FD_RESERVE), 1)
+
+
+async def resolve(host):
+    # -> address to connect to: literal addresses pass through, names are looked up once (socket.gaierror
+    # if they do not resolve) so probes never go back to DNS
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return infos[0][4][0]
+
+
+async def probe(host, port, timeout=TIMEOUT):
+    # -> "open", "closed" (refused / unreachable) or "filtered" (no answer within timeout); other errors,
+    # such as running out of file descriptors, are raised rather than reported as a closed port
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except asyncio.TimeoutError:
+        return "filtered"
+    except OSError as e:
+        if e.errno in CLOSED_ERRNOS:
+            return "closed"
+        raise
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return "open"
+
+
+class HostTiming:
+    # Per-host round-trip estimate and congestion window, after nmap / RFC 6298: the probe timeout is
+    # srtt + 4 * rttvar clamped to [MIN_TIMEOUT, MAX_TIMEOUT]. A timeout alone says nothing about congestion
+    # (filtered ports never answer), so the window starts fully open and only halves on real loss: a probe
+    # that went unanswered although its retry was answered.
+
+    def __init__(self, timeout=TIMEOUT, max_window=CONCURRENCY, adaptive=True):
+        self.initial = timeout
+        self.adaptive = adaptive
+        self.srtt = None
+        self.rttvar = 0.0
+        self.window = float(max_window)
+        self.max_window = max_window
+        self.threshold = float(max_window)
+        self.answered = 0
+        self.last_loss = None
+
+    def timeout(self, attempt=0):
+        if not self.adaptive:
+            return self.initial
+        base = self.initial if self.srtt is None else self.srtt + 4 * self.rttvar
+        # The first retry goes out with the same timeout; backoff only starts with the second
+        return min(max(base, min(MIN_TIMEOUT, self.initial)) * 2 ** max(attempt - 1, 0), MAX_TIMEOUT)
+
+    def answer(self, rtt, attempt=0):
+        self.answered += 1
+        if not self.adaptive:
+            return
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
         else:
-            print(f"❌ Port {port} is CLOSED")
-        s.close()
+            self.rttvar += (abs(self.srtt - rtt) - self.rttvar) / 4
+            self.srtt += (rtt - self.srtt) / 8
+        if attempt:
+            self.loss()
+            return
+        # Slow start below the threshold, then one extra probe per window's worth of answers
+        self.window += 1 if self.window < self.threshold else 1 / self.window
+        self.window = min(self.window, self.max_window)
+
+    def loss(self):
+        # Losses within one timeout of the last cut belong to the same congestion event
+        now = time.monotonic()
+        if self.last_loss is not None and now - self.last_loss < self.timeout():
+            return
+        self.last_loss = now
+        self.threshold = max(self.window / 2, 2)
+        self.window = max(self.window / 2, 1)
+
+
+class _Host:
+    def __init__(self, name, jobs, timing, address=None):
+        self.name = name
+        self.address = address or name
+        self.jobs = iter(jobs)  # (job number, port) pairs
+        self.timing = timing
+        self.retries = []  # heap of (due, job number, port, attempt)
+        self.in_flight = 0
+        self.exhausted = False
+
+    def next_probe(self, now):
+        # Due retries first, then fresh ports; None when nothing can be sent right now
+        if self.retries and self.retries[0][0] <= now:
+            _, number, port, attempt = heapq.heappop(self.retries)
+            return number, port, attempt
+        if not self.exhausted:
+            job = next(self.jobs, None)
+            if job is not None:
+                return (*job, 0)
+            self.exhausted = True
+        return None
+
+    def finished(self):
+        return self.exhausted and not self.retries and not self.in_flight
+
+
+def new_timing_stats():
+    return {"probes": 0, "retries": 0, "timeouts": 0, "timeout_range": None, "concurrency": None}
+
+
+async def _timed_probe(host, port, timeout):
+    started = time.monotonic()
+    state = await probe(host, port, timeout)
+    return state, time.monotonic() - started
+
+
+async def scan_stream(targets, ports, concurrency=CONCURRENCY, timeout=TIMEOUT, retries=RETRIES,
+                      adaptive=True, stats=None):
+    # Yields (host, port, state) as probes finish, or (host, None, "unresolved") once for a bad name
+    ports = list(ports)
+    hosts = ((name, enumerate(ports, index * len(ports))) for index, name in enumerate(targets))
+    async for host, port, _, state in _scan_hosts(hosts, concurrency, timeout, retries, adaptive, stats):
+        yield host, port, state
+
+
+async def _scan_hosts(hosts, concurrency=CONCURRENCY, timeout=TIMEOUT, retries=RETRIES, adaptive=True, stats=None):
+    # hosts yields (name, (job number, port) pairs); yields (host, port, job number, state) as probes finish,
+    # or a single (host, None, [its job numbers], "unresolved") for a name that does not resolve.
+    # At most `concurrency` connections are in flight, hosts are scanned HOST_GROUP at a time and jobs are
+    # drawn lazily, so memory stays flat for any number of targets. Unanswered probes are re-queued with
+    # backoff rather than holding up the batch, and each host's timeout and window follow its
+    # measured round-trip times (see HostTiming).
+    if stats is None:
+        stats = new_timing_stats()
+    concurrency = stats["concurrency"] = max_concurrency(concurrency)
+    hosts = iter(hosts)
+    active = deque()
+    pending = {}
+    targets_left = True
+
+    try:
+        while True:
+            while targets_left and len(active) < HOST_GROUP:
+                host = next(hosts, None)
+                if host is None:
+                    targets_left = False
+                    continue
+                name, jobs = host
+                try:
+                    address = await resolve(name)
+                except socket.gaierror:
+                    yield name, None, [number for number, _ in jobs], "unresolved"
+                    continue
+                active.append(_Host(name, jobs, HostTiming(timeout, max_window=concurrency, adaptive=adaptive),
+                                    address))
+
+            now = time.monotonic()
+            next_due = None
+            for host in list(active):
+                while len(pending) < concurrency and host.in_flight < int(host.timing.window):
+                    job = host.next_probe(now)
+                    if job is None:
+                        break
+                    number, port, attempt = job
+                    task = asyncio.ensure_future(_timed_probe(host.address, port, host.timing.timeout(attempt)))
+                    pending[task] = (host, number, port, attempt)
+                    host.in_flight += 1
+                    stats["probes"] += 1
+                    stats["retries"] += attempt > 0
+                if host.finished():
+                    active.remove(host)
+                    settled = host.timing.timeout()
+                    low, high = stats["timeout_range"] or (settled, settled)
+                    stats["timeout_range"] = (min(low, settled), max(high, settled))
+                elif host.retries and (next_due is None or host.retries[0][0] < next_due):
+                    next_due = host.retries[0][0]
+
+            if not pending:
+                if next_due is not None:
+                    await asyncio.sleep(max(next_due - time.monotonic(), 0))
+                    continue
+                if not active and not targets_left:
+                    return
+                continue
+
+            wait = None if next_due is None else max(next_due - time.monotonic(), 0)
+            done, _ = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                host, number, port, attempt = pending.pop(task)
+                host.in_flight -= 1
+                state, elapsed = task.result()
+                if state != "filtered":
+                    host.timing.answer(elapsed, attempt)
+                    yield host.name, port, number, state
+                    continue
+                stats["timeouts"] += 1
+                if attempt < retries:
+                    # The first retry goes out at once, later ones wait a timeout's worth first
+                    backoff = host.timing.timeout(attempt) if attempt else 0.0
+                    heapq.heappush(host.retries, (time.monotonic() + backoff, number, port, attempt + 1))
+                else:
+                    yield host.name, port, number, state
+    finally:
+        # An error (or the consumer stopping early) must not leave probes running unattended
+        for task in pending:
+            task.cancel()
+
+
+async def _print_scan(targets, ports, concurrency, timeout, show_closed, retries, adaptive, stats):
+    counts = {"open": 0, "closed": 0, "filtered": 0, "unresolved": 0}
+    async for host, port, state in scan_stream(targets, ports, concurrency, timeout, retries, adaptive, stats):
+        counts[state] += 1
+        if state == "unresolved":
+            print(f"❓ {host} could not be resolved; skipped", flush=True)
+        elif state == "open":
+            print(f"✅ {host} port {port} is OPEN", flush=True)
+        elif show_closed:
+            print(f"❌ {host} port {port} is {state.upper()}", flush=True)
+    return counts
+
+
+async def _quiet_scan(targets, ports, concurrency, timeout, retries, adaptive):
+    async for _ in scan_stream(targets, ports, concurrency, timeout, retries, adaptive):
+        pass
+
+
+def print_counts(counts, seconds):
+    scanned = counts["open"] + counts["closed"] + counts["filtered"]
+    unresolved = counts["unresolved"]
+    unresolved = f", {unresolved} unresolved host{'s' if unresolved > 1 else ''}" if unresolved else ""
+    print(f"\n📊 {scanned} ports in {seconds:.2f}s: "
+          f"{counts['open']} open, {counts['closed']} closed, {counts['filtered']} filtered{unresolved}")
+
+
+def print_timing(stats, timeout, adaptive, concurrency=CONCURRENCY):
+    settled = stats["timeout_range"]
+    if stats["concurrency"] is not None and stats["concurrency"] < concurrency:
+        print(f"⚠️  Concurrency capped at {stats['concurrency']} by the open-file limit (asked for {concurrency})")
+    print(f"⏱️  {stats['probes']} probes sent, {stats['retries']} retries, {stats['timeouts']} timed out")
+    if adaptive and settled:
+        print(f"⏱️  Per-host timeouts settled at {settled[0] * 1000:.0f}-{settled[1] * 1000:.0f} ms "
+              f"(initial {timeout * 1000:.0f} ms)")
+
+
+def scan_ports(target, ports=COMMON_PORTS, concurrency=CONCURRENCY, timeout=TIMEOUT, show_closed=True,
+               retries=RETRIES, adaptive=True, compare=False):
+    print(f"\n🔍 Scanning target: {target}")
+    stats = new_timing_stats()
+    started = time.perf_counter()
+    counts = asyncio.run(_print_scan(iter_targets([target]), ports, concurrency, timeout, show_closed, retries,
+                                     adaptive, stats))
+    seconds = time.perf_counter() - started
+    print_counts(counts, seconds)
+    print_timing(stats, timeout, adaptive, concurrency)
+    if compare:
+        # Only a second scan can tell what the other timing mode would have cost in wall-clock time
+        started = time.perf_counter()
+        asyncio.run(_quiet_scan(iter_targets([target]), ports, concurrency, timeout, retries, not adaptive))
+        other = time.perf_counter() - started
+        adaptive_seconds, fixed_seconds = (seconds, other) if adaptive else (other, seconds)
+        print(f"⏱️  Wall clock: {adaptive_seconds:.2f}s adaptive vs {fixed_seconds:.2f}s with a fixed "
+              f"{timeout:g}s timeout ({fixed_seconds - adaptive_seconds:+.2f}s saved)")
+    return counts
+
+
+class CompletionBitmap:
+    # One bit per (host, port) job, memory-mapped so a /16 sweep costs page cache, not process memory
+
+    def __init__(self, path, bits):
+        size = max((bits + 7) // 8, 1)
+        with open(path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def __contains__(self, n):
+        return self._map[n >> 3] >> (n & 7) & 1
+
+    def add(self, n):
+        self._map[n >> 3] |= 1 << (n & 7)
+
+    def all_set(self, start, stop):
+        # Whole bytes are compared at once; only the ragged edges are checked bit by bit
+        first, last = -(-start // 8), stop // 8
+        if first >= last:
+            return all(n in self for n in range(start, stop))
+        full = self._map[first:last]
+        if full.count(b"\xff") != len(full):
+            return False
+        edges = list(range(start, first * 8)) + list(range(last * 8, stop))
+        return all(n in self for n in edges)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _recover_tail(results_path, manifest, ports, bitmap):
+    # Results past the last synced offset reached the file but maybe not the bitmap: drop a torn final
+    # line, then mark the complete ones done so they are neither lost nor scanned twice
+    with open(results_path, "a+b") as f:
+        f.seek(manifest["synced"])
+        tail = f.read()
+        keep = tail.rfind(b"\n") + 1
+        if keep < len(tail):
+            f.truncate(manifest["synced"] + keep)
+    records = Counter()
+    for line in tail[:keep].splitlines():
+        record = json.loads(line)
+        records[record["host"], record["port"]] += 1
+    if records:
+        port_index = {port: i for i, port in enumerate(ports)}
+        names = {host for host, _ in records}
+        for index, name in enumerate(iter_targets(manifest["targets"])):
+            if name not in names:
+                continue
+            # An "unresolved" record (port None) covers every port of one occurrence of the host
+            unresolved = records[name, None] > 0
+            for port in ports:
+                number = index * len(ports) + port_index[port]
+                if (unresolved or records[name, port]) and number not in bitmap:
+                    bitmap.add(number)
+                    if not unresolved:
+                        records[name, port] -= 1
+                    manifest["completed"] += 1
+            if unresolved:
+                records[name, None] -= 1
+    manifest["synced"] += keep
+    return sum(1 for _ in tail[:keep].splitlines())
+
+
+def _host_jobs(start, ports, bitmap):
+    for i, port in enumerate(ports, start):
+        if i not in bitmap:
+            yield i, port
+
+
+def _pending_jobs(targets, ports, bitmap):
+    # (host, (job number, port) pairs) for every job not yet marked done; finished hosts are skipped whole
+    for index, name in enumerate(targets):
+        start = index * len(ports)
+        if not bitmap.all_set(start, start + len(ports)):
+            yield name, _host_jobs(start, ports, bitmap)
+
+
+async def _run_job(results_path, manifest_path, manifest, ports, bitmap, concurrency, timeout, retries, adaptive,
+                   stats, counts):
+    unsynced = []
+    last_sync = time.monotonic()
+
+    def sync():
+        # Results are made durable before their bits are set, and bits before the manifest moves past them
+        out.flush()
+        os.fsync(out.fileno())
+        for number in unsynced:
+            bitmap.add(number)
+        bitmap.flush()
+        manifest["completed"] += len(unsynced)
+        manifest["synced"] = out.tell()
+        save_manifest(manifest_path, manifest)
+        unsynced.clear()
+
+    hosts = _pending_jobs(iter_targets(manifest["targets"]), ports, bitmap)
+    with open(results_path, "a") as out:
+        try:
+            async for host, port, number, state in _scan_hosts(hosts, concurrency, timeout, retries, adaptive, stats):
+                out.write(json.dumps({"host": host, "port": port, "state": state}) + "\n")
+                counts[state] += 1
+                if state == "unresolved":
+                    # One record stands for all of the host's jobs
+                    unsynced.extend(number)
+                    print(f"❓ {host} could not be resolved; skipped", flush=True)
+                else:
+                    unsynced.append(number)
+                if state == "open":
+                    print(f"✅ {host} port {port} is OPEN", flush=True)
+                if len(unsynced) >= SYNC_EVERY or time.monotonic() - last_sync >= SYNC_SECONDS:
+                    sync()
+                    last_sync = time.monotonic()
+            manifest["finished"] = True
+        finally:
+            sync()
+
+
+def run_job(job_dir, targets=None, port_spec=None, concurrency=CONCURRENCY, timeout=TIMEOUT, retries=RETRIES,
+            adaptive=True):
+    # Resumable scan: results are appended to results.jsonl, finished (host, port) jobs are recorded in
+    # done.bitmap and manifest.json ties both together, so an interrupted job restarts where it stopped
+    os.makedirs(job_dir, exist_ok=True)
+    manifest_path = os.path.join(job_dir, "manifest.json")
+    results_path = os.path.join(job_dir, "results.jsonl")
+    manifest = load_manifest(manifest_path)
+    if manifest is None:
+        if not targets:
+            raise ValueError(f"no job in {job_dir}; give targets to start one")
+        port_spec = port_spec or ",".join(map(str, COMMON_PORTS))
+        manifest = {"targets": targets, "ports": port_spec, "hosts": count_targets(targets),
+                    "port_count": len(parse_ports(port_spec)), "synced": 0, "completed": 0, "finished": False}
+        open(results_path, "w").close()
+        save_manifest(manifest_path, manifest)
+    elif (targets and targets != manifest["targets"]) or (port_spec and port_spec != manifest["ports"]):
+        raise ValueError(f"{job_dir} holds a job for {','.join(manifest['targets'])} ports {manifest['ports']}")
+
+    ports = parse_ports(manifest["ports"])
+    total = manifest["hosts"] * len(ports)
+    bitmap = CompletionBitmap(os.path.join(job_dir, "done.bitmap"), total)
+    try:
+        recovered = _recover_tail(results_path, manifest, ports, bitmap)
+        if recovered:
+            bitmap.flush()
+            save_manifest(manifest_path, manifest)
+        if manifest["finished"]:
+            print(f"✅ Job already complete ({total} ports); results in {results_path}")
+            return None
+        if manifest["completed"]:
+            print(f"🔁 Resuming job: {manifest['completed']}/{total} ports already scanned")
+        print(f"\n🔍 Scanning {','.join(manifest['targets'])} ({manifest['hosts']} hosts x {len(ports)} ports)")
+        stats = new_timing_stats()
+        counts = {"open": 0, "closed": 0, "filtered": 0, "unresolved": 0}
+        started = time.perf_counter()
+        try:
+            asyncio.run(_run_job(results_path, manifest_path, manifest, ports, bitmap, concurrency, timeout,
+                                 retries, adaptive, stats, counts))
+        except KeyboardInterrupt:
+            print(f"\n⏸️  Interrupted at {manifest['completed']}/{total}; run the same command to resume")
+            return counts
+        seconds = time.perf_counter() - started
+    finally:
+        bitmap.close()
+    print_counts(counts, seconds)
+    print_timing(stats, timeout, adaptive, concurrency)
+    print(f"💾 Results in {results_path}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent TCP connect scanner (authorized targets only)")
+    parser.add_argument("targets", nargs="*", help="Hosts, addresses or CIDR blocks (comma separated allowed)")
+    parser.add_argument("-p", "--ports", help="Ports and ranges, e.g. 22,80,8000-8100 or 1-65535")
+    parser.add_argument("-c", "--concurrency", type=int, default=CONCURRENCY, help="Connections in flight")
+    parser.add_argument("-t", "--timeout", type=float, default=TIMEOUT,
+                        help="Initial per-connection timeout in seconds (adapted to measured RTTs)")
+    parser.add_argument("-r", "--retries", type=int, default=RETRIES, help="Retries for unanswered probes")
+    parser.add_argument("--fixed-timing", action="store_true",
+                        help="Keep the timeout and concurrency fixed (for comparison)")
+    parser.add_argument("--compare-timing", action="store_true",
+                        help="Rescan quietly with the other timing mode and report the wall-clock difference")
+    parser.add_argument("--open", action="store_true", help="Only print open ports")
+    parser.add_argument("--job", metavar="DIR", help="Resumable job directory (JSONL results + completion bitmap)")
+    args = parser.parse_args()
+
+    if args.job:
+        if args.compare_timing:
+            parser.error("--compare-timing cannot be used with --job")
+        try:
+            run_job(args.job, args.targets, args.ports, max(args.concurrency, 1), args.timeout,
+                    max(args.retries, 0), not args.fixed_timing)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        except OSError as e:
+            sys.exit(f"❌ Scan stopped: {e}; finished results are saved, run the same command to resume")
+        return
+
+    try:
+        if not args.targets:
+            target_ip = input("Enter the target IP address: ")
+            scan_ports(target_ip)
+            return
+        ports = parse_ports(args.ports) if args.ports else COMMON_PORTS
+        targets = ",".join(args.targets)
+        scan_ports(targets, ports, max(args.concurrency, 1), args.timeout, not args.open, max(args.retries, 0),
+                   not args.fixed_timing, args.compare_timing)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    except OSError as e:
+        sys.exit(f"❌ Scan stopped: {e}")
+
 
 if __name__ == "__main__":
-    target_ip = input("Enter the target IP address: ")
-    scan_ports(target_ip)
+    main()
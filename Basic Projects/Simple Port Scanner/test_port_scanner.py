@@ -0,0 +1,11 @@
+import port_scanner
+
+SPECS = ["10.0.0.0/24", "10.0.0.0/30", "10.0.0.0/31", "10.0.0.7/32", "192.168.0.0/22",
+         "::1/120", "fe80::/126", "::/125", "::/127", "::/128", "2001:db8::/116",
+         "example.com", "10.0.0.0/31,::/125,10.0.0.1"]
+
+
+def test_count_targets_matches_iter_targets():
+    for spec in SPECS:
+        assert port_scanner.count_targets([spec]) == sum(1 for _ in port_scanner.iter_targets([spec])), spec
+    assert port_scanner.count_targets(SPECS) == sum(1 for _ in port_scanner.iter_targets(SPECS))
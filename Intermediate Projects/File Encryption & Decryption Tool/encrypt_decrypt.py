@@ -1,5 +1,35 @@
+import argparse
+import base64
+import mmap
 import os
-from cryptography.fernet import Fernet
+import struct
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# Segmented container: header | segment 0 | segment 1 | ... | final segment
+# header  = magic, segment size (u32 LE), 16-byte salt, 7-byte nonce prefix; also the AAD of every segment
+# segment = AES-256-GCM(plaintext[i]) + 16-byte tag, nonce = prefix | counter (u32 BE) | last-segment flag
+# The file key is HKDF-SHA256(secret.key, salt), so every file gets its own key. Because the counter and
+# the last flag are part of each nonce, reordered, dropped, truncated or appended segments fail to decrypt
+# (the STREAM construction of Hoang et al.).
+MAGIC = b"FENCSEG\x01"
+HEADER = struct.Struct("<8sI16s7s")
+TAG_SIZE = 16
+SEGMENT_SIZE = 256 * 1024
+MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+MAX_SEGMENTS = 2 ** 32
+KDF_INFO = b"encrypt_decrypt.py segmented v1"
+# Files in flight in directory mode, so reads, crypto and writes of different files overlap
+TREE_WORKERS = 4
+
 
 def generate_key():
     key = Fernet.generate_key()
@@ -18,32 +48,288 @@ def load_key():
         print("Error: 'secret.key' not found. Please generate a key first (option 1).")
         exit()
 
-def encrypt_file(filename):
-    key = load_key()
-    fernet = Fernet(key)
+def derive_key(key, salt):
+    # secret.key is a Fernet key: 32 random bytes, base64 encoded
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=KDF_INFO)
+    return hkdf.derive(base64.urlsafe_b64decode(key))
 
-    with open(filename, "rb") as file:
-        data = file.read()
+def segment_nonce(prefix, index, last):
+    return prefix + struct.pack(">IB", index, last)
 
-    encrypted = fernet.encrypt(data)
-    with open(filename + ".enc", "wb") as file:
-        file.write(encrypted)
-    print(f"✅ File '{filename}' encrypted successfully!")
+def read_full(f, size):
+    # Pipes may return short reads; segments must be full-sized except the last
+    data = f.read(size)
+    while data and len(data) < size:
+        more = f.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
 
-def decrypt_file(filename):
-    key = load_key()
-    fernet = Fernet(key)
+def iter_segments(src, size):
+    # -> (index, chunk, last); reads one segment ahead so the final one can be flagged
+    chunk = read_full(src, size)
+    index = 0
+    while True:
+        following = read_full(src, size)
+        last = not following
+        yield index, chunk, last
+        if last:
+            return
+        chunk = following
+        index += 1
+        if index >= MAX_SEGMENTS:
+            raise ValueError("file too large for the segment counter; use a larger segment size")
+
+def ordered_map(func, items, workers=1):
+    # Like map(), but up to workers * 4 items are processed at once on a thread pool (AES-GCM releases
+    # the GIL) and results still come back in input order, so memory stays bounded by the window
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for item in items:
+            window.append(pool.submit(func, item))
+            if len(window) >= workers * 4:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+def encrypt_stream(src, dst, key, segment_size=SEGMENT_SIZE, workers=1):
+    # Constant memory: only the segments in flight (two when serial) are held at once
+    if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise ValueError(f"segment size must be between 1 and {MAX_SEGMENT_SIZE} bytes")
+    salt, prefix = os.urandom(16), os.urandom(7)
+    header = HEADER.pack(MAGIC, segment_size, salt, prefix)
+    aead = AESGCM(derive_key(key, salt))
+    dst.write(header)
+
+    def seal(segment):
+        index, chunk, last = segment
+        return aead.encrypt(segment_nonce(prefix, index, last), chunk, header)
+
+    for sealed in ordered_map(seal, iter_segments(src, segment_size), workers):
+        dst.write(sealed)
 
+def read_header(f):
+    # -> (header bytes, segment size, salt, nonce prefix), or None if this is not a segmented file
+    header = f.read(HEADER.size)
+    if len(header) < HEADER.size or not header.startswith(MAGIC):
+        return None
+    _, segment_size, salt, prefix = HEADER.unpack(header)
+    if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise InvalidTag("corrupt header")
+    return header, segment_size, salt, prefix
+
+def decrypt_stream(src, dst, key, workers=1):
+    # Raises InvalidTag if any segment was modified, reordered, dropped, or the file was cut short
+    parsed = read_header(src)
+    if parsed is None:
+        raise InvalidTag("not a segmented encrypted file")
+    header, segment_size, salt, prefix = parsed
+    aead = AESGCM(derive_key(key, salt))
+
+    def open_segment(segment):
+        index, chunk, last = segment
+        if len(chunk) < TAG_SIZE:
+            raise InvalidTag("truncated segment")
+        return aead.decrypt(segment_nonce(prefix, index, last), chunk, header)
+
+    for plain in ordered_map(open_segment, iter_segments(src, segment_size + TAG_SIZE), workers):
+        dst.write(plain)
+
+def plaintext_size(sealed_size, segment_size):
+    # Every segment but the last holds exactly segment_size bytes, so the layout follows from the file size
+    body = sealed_size - HEADER.size
+    if body < TAG_SIZE:
+        raise InvalidTag("truncated file")
+    segments = -(-body // (segment_size + TAG_SIZE))
+    return (segments - 1) * segment_size + body - (segments - 1) * (segment_size + TAG_SIZE) - TAG_SIZE, segments
+
+def decrypt_range(filename, offset, length, key=None):
+    # Decrypt only plaintext bytes [offset, offset + length) of a segmented file. Segment i starts at
+    # HEADER.size + i * (segment size + TAG_SIZE), so the covering segments are found by arithmetic and
+    # read through mmap; only those segments are authenticated.
+    if offset < 0 or length < 0:
+        raise ValueError("offset and length must not be negative")
+    key = key or load_key()
     with open(filename, "rb") as file:
-        data = file.read()
+        parsed = read_header(file)
+        if parsed is None:
+            raise ValueError("random access needs the segmented format; re-encrypt this file")
+        header, segment_size, salt, prefix = parsed
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size, segments = plaintext_size(len(data), segment_size)
+            end = min(offset + length, size)
+            if offset >= end:
+                return b""
+            aead = AESGCM(derive_key(key, salt))
+            sealed_size = segment_size + TAG_SIZE
+            first, last = offset // segment_size, (end - 1) // segment_size
+            plain = bytearray()
+            for index in range(first, last + 1):
+                start = HEADER.size + index * sealed_size
+                plain += aead.decrypt(segment_nonce(prefix, index, index == segments - 1),
+                                      data[start:start + sealed_size], header)
+    skip = offset - first * segment_size
+    return bytes(plain[skip:skip + end - offset])
+
+def is_segmented(filename):
+    with open(filename, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+def _write_atomically(path, write):
+    # Output goes to a temporary file next to path and replaces it only once write() succeeded,
+    # so a failed authentication never leaves partial plaintext (or ciphertext) behind
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def encrypt_to(source, target, key, segment_size=SEGMENT_SIZE, workers=1):
+    with open(source, "rb") as file:
+        _write_atomically(target, lambda out: encrypt_stream(file, out, key, segment_size, workers))
 
-    decrypted = fernet.decrypt(data)
+def decrypt_to(source, target, key, workers=1):
+    # Raises InvalidTag / InvalidToken when the file does not authenticate
+    if not is_segmented(source):
+        # Files from older versions are a single Fernet token and are decrypted in one piece
+        with open(source, "rb") as file:
+            decrypted = Fernet(key).decrypt(file.read())
+        _write_atomically(target, lambda out: out.write(decrypted))
+    else:
+        with open(source, "rb") as file:
+            _write_atomically(target, lambda out: decrypt_stream(file, out, key, workers))
+
+def encrypt_file(filename, segment_size=SEGMENT_SIZE, workers=1, key=None):
+    encrypt_to(filename, filename + ".enc", key or load_key(), segment_size, workers)
+    print(f"✅ File '{filename}' encrypted successfully!")
+
+def decrypt_file(filename, workers=1, key=None):
     original_name = filename.replace(".enc", "_decrypted.txt")
-    with open(original_name, "wb") as file:
-        file.write(decrypted)
+    try:
+        decrypt_to(filename, original_name, key or load_key(), workers)
+    except InvalidToken:
+        print("❌ Decryption failed: wrong key or corrupted file.")
+        return
+    except InvalidTag:
+        print("❌ Decryption failed: wrong key, or the file was modified or truncated.")
+        return
     print(f"🔓 File decrypted successfully as '{original_name}'")
 
-if __name__ == "__main__":
+def iter_tree(root, skip_dir=None):
+    # Regular files under root, depth first; symlinks are not followed so link loops cannot recurse
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            print(f"⚠️  Cannot read {directory}: {e}")
+            continue
+        for entry in sorted(entries, key=lambda e: e.name, reverse=True):
+            if entry.is_dir(follow_symlinks=False):
+                if not (skip_dir and os.path.abspath(entry.path) == skip_dir):
+                    stack.append(entry.path)
+            elif entry.is_file(follow_symlinks=False) and not entry.name.startswith(".tmp-"):
+                yield entry
+
+def tree_jobs(root, decrypt=False, output_dir=None):
+    # -> (source path, target path, source stat) for every file to process under root. Targets go next
+    # to their sources, or into the same relative place under output_dir
+    skip_dir = os.path.abspath(output_dir) if output_dir else None
+    for entry in iter_tree(root, skip_dir):
+        if entry.name.endswith(".enc") != decrypt:
+            continue
+        if output_dir:
+            relative = os.path.relpath(entry.path, root)
+            target = os.path.join(output_dir, relative[:-len(".enc")] if decrypt else relative + ".enc")
+        elif decrypt:
+            target = os.path.join(os.path.dirname(entry.path), entry.name.replace(".enc", "_decrypted.txt"))
+        else:
+            target = entry.path + ".enc"
+        yield entry.path, target, entry.stat(follow_symlinks=False)
+
+def process_tree(root, decrypt=False, output_dir=None, workers=TREE_WORKERS, segment_size=SEGMENT_SIZE):
+    # Encrypt (or decrypt) every file under root with one key load. Files go through a thread pool with
+    # a bounded window, so reading, crypto and writing of different files overlap while memory stays
+    # flat for any tree size. Each target is stamped with its source's mtime; a target whose mtime
+    # already matches is up to date and skipped.
+    key = load_key()
+    counts = Counter()
+
+    def process(job):
+        source, target, stat = job
+        try:
+            if os.stat(target).st_mtime_ns == stat.st_mtime_ns:
+                return "up to date", 0
+        except FileNotFoundError:
+            pass
+        try:
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            if decrypt:
+                decrypt_to(source, target, key)
+            else:
+                encrypt_to(source, target, key, segment_size)
+            os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        except (InvalidTag, InvalidToken):
+            print(f"❌ {source}: wrong key, or the file was modified or truncated")
+            return "failed", 0
+        except (OSError, ValueError) as e:
+            print(f"❌ {source}: {e}")
+            return "failed", 0
+        return "decrypted" if decrypt else "encrypted", stat.st_size
+
+    started = time.perf_counter()
+    for status, size in ordered_map(process, tree_jobs(root, decrypt, output_dir), workers):
+        counts[status] += 1
+        counts["bytes"] += size
+    seconds = time.perf_counter() - started
+    done = counts["decrypted" if decrypt else "encrypted"]
+    print(f"📊 {done} {'decrypted' if decrypt else 'encrypted'}, {counts['up to date']} up to date, "
+          f"{counts['failed']} failed: {counts['bytes'] / 1e6:.1f} MB in {seconds:.2f}s "
+          f"({counts['bytes'] / 1e6 / max(seconds, 1e-9):.1f} MB/s, {done / max(seconds, 1e-9):.0f} files/s)")
+    return counts
+
+def benchmark(size_mb=512, worker_counts=(1, 2, 4, 8), segment_size=SEGMENT_SIZE):
+    # Encrypts and decrypts a temporary file of size_mb with a throwaway key at each worker count
+    key = Fernet.generate_key()
+    block = os.urandom(1024 * 1024)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain, sealed = os.path.join(tmp, "plain.bin"), os.path.join(tmp, "plain.bin.enc")
+        with open(plain, "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+        size = size_mb * 1024 * 1024
+        print(f"⏱️  {size_mb} MiB, {segment_size // 1024} KiB segments, {os.cpu_count()} CPU(s)")
+        print(f"{'workers':>8} {'encrypt GB/s':>14} {'decrypt GB/s':>14}")
+        for workers in worker_counts:
+            started = time.perf_counter()
+            with open(plain, "rb") as src, open(sealed, "wb") as dst:
+                encrypt_stream(src, dst, key, segment_size, workers)
+            encrypt_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            with open(sealed, "rb") as src, open(os.devnull, "wb") as dst:
+                decrypt_stream(src, dst, key, workers)
+            decrypt_seconds = time.perf_counter() - started
+            print(f"{workers:>8} {size / encrypt_seconds / 1e9:>14.2f} {size / decrypt_seconds / 1e9:>14.2f}")
+
+def resolve(fname, base_dir=None):
+    # The interactive menu looks relative names up next to the script; the command line uses them as given
+    if base_dir and not os.path.isabs(fname):
+        fname = os.path.join(base_dir, fname)
+    if not os.path.exists(fname):
+        print(f"Error: File not found: {fname}")
+        exit()
+    return fname
+
+def menu():
     print("🔒 File Encryption & Decryption Tool 🔒")
     print("1 Generate Key\n2 Encrypt File\n3 Decrypt File")
     choice = input("Choose an option: ")
@@ -55,19 +341,73 @@ if __name__ == "__main__":
         generate_key()
     elif choice == "2":
         fname = input("Enter filename to encrypt: ")
-        # Convert to absolute path if not already
-        if not os.path.isabs(fname):
-            fname = os.path.join(script_dir, fname)
-        if not os.path.exists(fname):
-            print(f"Error: File not found: {fname}")
-            exit()
-        encrypt_file(fname)
+        encrypt_file(resolve(fname, script_dir))
     elif choice == "3":
         fname = input("Enter filename to decrypt: ")
-        # Convert to absolute path if not already
-        if not os.path.isabs(fname):
-            fname = os.path.join(script_dir, fname)
-        if not os.path.exists(fname):
-            print(f"Error: File not found: {fname}")
-            exit()
-        decrypt_file(fname)
+        decrypt_file(resolve(fname, script_dir))
+
+def main():
+    parser = argparse.ArgumentParser(description="Encrypt and decrypt files with the key in secret.key")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("keygen", help="Generate secret.key")
+    enc = sub.add_parser("encrypt", help="Encrypt FILE to FILE.enc, or every file under a directory")
+    enc.add_argument("file")
+    enc.add_argument("--segment-size", type=int, default=SEGMENT_SIZE,
+                     help="Plaintext bytes per authenticated segment")
+    dec = sub.add_parser("decrypt", help="Decrypt FILE.enc, or every .enc file under a directory")
+    dec.add_argument("file")
+    for command in (enc, dec):
+        command.add_argument("-j", "--workers", type=int,
+                             help=f"Threads for segment crypto (default 1), or files in flight for a directory "
+                                  f"(default {TREE_WORKERS}); 0 = all cores")
+        command.add_argument("-o", "--output", help="Directory mode: mirror results into this directory")
+    read = sub.add_parser("read", help="Decrypt only a byte range of FILE.enc")
+    read.add_argument("file")
+    read.add_argument("--offset", type=int, default=0, help="First plaintext byte")
+    read.add_argument("--length", type=int, required=True, help="Number of bytes")
+    read.add_argument("-o", "--output", help="Write the bytes here instead of stdout")
+    bench = sub.add_parser("benchmark", help="Measure GB/s at several worker counts")
+    bench.add_argument("--size-mb", type=int, default=512, help="Test file size in MiB")
+    bench.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    bench.add_argument("--segment-size", type=int, default=SEGMENT_SIZE)
+    args = parser.parse_args()
+    if getattr(args, "workers", None) == 0:
+        args.workers = os.cpu_count() or 1
+
+    if args.command is None:
+        menu()
+    elif args.command == "keygen":
+        generate_key()
+    elif args.command in ("encrypt", "decrypt") and os.path.isdir(args.file):
+        if args.command == "encrypt" and not 0 < args.segment_size <= MAX_SEGMENT_SIZE:
+            sys.exit(f"❌ segment size must be between 1 and {MAX_SEGMENT_SIZE} bytes")
+        workers = TREE_WORKERS if args.workers is None else max(args.workers, 1)
+        process_tree(args.file, args.command == "decrypt", args.output, workers,
+                     getattr(args, "segment_size", SEGMENT_SIZE))
+    elif args.command == "encrypt":
+        try:
+            encrypt_file(resolve(args.file), args.segment_size, max(args.workers or 1, 1))
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+    elif args.command == "decrypt":
+        decrypt_file(resolve(args.file), max(args.workers or 1, 1))
+    elif args.command == "read":
+        started = time.perf_counter()
+        try:
+            data = decrypt_range(resolve(args.file), args.offset, args.length)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        except InvalidTag:
+            sys.exit("❌ Decryption failed: wrong key, or the file was modified or truncated.")
+        if args.output:
+            with open(args.output, "wb") as out:
+                out.write(data)
+        else:
+            sys.stdout.buffer.write(data)
+        print(f"🔓 {len(data)} bytes from offset {args.offset} in {(time.perf_counter() - started) * 1000:.2f} ms",
+              file=sys.stderr)
+    elif args.command == "benchmark":
+        benchmark(args.size_mb, [int(n) for n in args.workers.split(",")], args.segment_size)
+
+if __name__ == "__main__":
+    main()
@@ -1,87 +1,415 @@
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import json
 import psutil
 import os
+import random
+import re
+import struct
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def check_suspicious_paths():
+# Common keywords found in keylogger process names or descriptions
+KEYLOGGER_KEYWORDS = [
+    "keylogger", "hook", "keyboard", "logger", "spy", "monitor", "capture",
+    "input", "record", "track", "type", "keys", "intercept", "listen"
+]
+PROCESS_ATTRS = ['pid', 'name', 'exe', 'cmdline', 'username']
+
+def compile_keywords(keywords):
+    """Compile keywords into one regex that finds any of them in a single pass over the text."""
+    # Factor shared prefixes into a trie ("key(?:board|logger|s)") so the engine does not retry
+    # every alternative at each position
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        node[''] = True
+    if not trie:
+        raise ValueError("no keywords to match")
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return re.compile(build(trie))
+
+def load_keywords(path):
+    """Read keywords from a file: one per line, blank lines and # comments ignored."""
+    with open(path, encoding='utf-8') as f:
+        keywords = [line.split('#', 1)[0].strip() for line in f]
+    keywords = [keyword for keyword in keywords if keyword]
+    if not keywords:
+        raise ValueError(f"{path} contains no keywords")
+    return keywords
+
+KEYLOGGER_PATTERN = compile_keywords(KEYLOGGER_KEYWORDS)
+
+SUSPICIOUS_EXTENSIONS = (".log", ".txt", ".dat", ".key", ".keylog")
+RECENT_SECONDS = 86400  # files modified within the last 24 hours are reported
+INDEX_FILE = os.path.join(os.path.expanduser("~"), ".cache", "keylogger_detector", "dir_index.json")
+# A directory changed this close to the start of a scan may change again within the same mtime tick,
+# so it is not trusted on the next run
+RACY_NS = 2 * 10**9
+
+def suspicious_locations():
+    """Directories where keyloggers commonly drop their files on this platform."""
+    if os.name == 'nt':
+        return [
+            os.path.expanduser("~\\AppData\\Local\\Temp"),
+            os.path.expanduser("~\\AppData\\Roaming"),
+            "C:\\Windows\\Temp",
+            "C:\\Program Files",
+            "C:\\Program Files (x86)"
+        ]
+    home = os.path.expanduser("~")
+    return ["/tmp", "/var/tmp", "/dev/shm", os.path.join(home, ".cache"), os.path.join(home, ".local")]
+
+def load_index(path):
+    """Directory index from a previous scan: path -> [mtime_ns, subdirectories, {file: mtime}]."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_index(path, index):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(tmp, path)
+
+def _scan_directory(path, cached, extensions, racy_after):
+    # -> (index entry or None if unreadable, whether the cached listing was reused)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, False
+    if cached and cached[0] == mtime:
+        # Nothing was added, removed or renamed here, so the listing still holds; only the known
+        # candidate files are re-stat'ed, since writing to a file does not touch its directory's mtime
+        files = {}
+        for name in cached[2]:
+            try:
+                files[name] = os.stat(os.path.join(path, name)).st_mtime
+            except OSError:
+                continue
+        return [mtime, cached[1], files], True
+    subdirs, files = [], {}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.name.endswith(extensions):
+                        files[entry.name] = entry.stat().st_mtime
+                except OSError:
+                    continue
+    except OSError:
+        return None, False
+    return [None if mtime >= racy_after else mtime, subdirs, files], False
+
+def scan_locations(locations, index=None, extensions=SUSPICIOUS_EXTENSIONS, workers=None):
+    """
+    Walk `locations` one directory level at a time on a thread pool, reusing `index` for directories
+    whose mtime has not changed. Returns (new index, {file path: mtime}, directories rescanned).
+    """
+    index = index or {}
+    new_index, files = {}, {}
+    rescanned = 0
+    racy_after = time.time_ns() - RACY_NS
+    frontier = [location for location in dict.fromkeys(locations) if os.path.isdir(location)]
+    with ThreadPoolExecutor(workers) as pool:
+        while frontier:
+            results = pool.map(lambda path: _scan_directory(path, index.get(path), extensions, racy_after),
+                               frontier)
+            next_frontier = []
+            for path, (entry, reused) in zip(frontier, results):
+                if entry is None:
+                    continue
+                new_index[path] = entry
+                rescanned += not reused
+                next_frontier.extend(os.path.join(path, name) for name in entry[1])
+                for name, mtime in entry[2].items():
+                    files[os.path.join(path, name)] = mtime
+            # Overlapping locations would otherwise be walked twice
+            frontier = [path for path in next_frontier if path not in new_index]
+    return new_index, files, rescanned
+
+def _file_report(path, mtime):
+    return {'path': path, 'modified': datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')}
+
+def check_suspicious_paths(locations=None, index_path=INDEX_FILE, workers=None):
     """Check common paths where keyloggers might hide their files."""
-    suspicious_paths = []
-    common_locations = [
-        os.path.expanduser("~\\AppData\\Local\\Temp"),
-        os.path.expanduser("~\\AppData\\Roaming"),
-        "C:\\Windows\\Temp",
-        "C:\\Program Files",
-        "C:\\Program Files (x86)"
-    ]
-    
-    suspicious_extensions = [".log", ".txt", ".dat", ".key", ".keylog"]
-    
     print("\nChecking suspicious file locations...")
-    for location in common_locations:
-        if not os.path.exists(location):
-            continue
-            
+    started = time.perf_counter()
+    index, files, rescanned = scan_locations(locations or suspicious_locations(),
+                                             load_index(index_path) if index_path else None, workers=workers)
+    if index_path:
         try:
-            for root, _, files in os.walk(location):
-                for file in files:
-                    if any(file.endswith(ext) for ext in suspicious_extensions):
-                        try:
-                            file_path = os.path.join(root, file)
-                            # Check if file was modified recently (last 24 hours)
-                            mtime = os.path.getmtime(file_path)
-                            if time.time() - mtime < 86400:  # 24 hours in seconds
-                                suspicious_paths.append({
-                                    'path': file_path,
-                                    'modified': datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
-                                })
-                        except (PermissionError, OSError):
-                            continue
-        except (PermissionError, OSError):
-            continue
-    
-    return suspicious_paths
+            save_index(index_path, index)
+        except OSError as e:
+            print(f"Could not save directory index: {e}")
+    print(f"{len(index)} directories checked, {rescanned} listed "
+          f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    cutoff = time.time() - RECENT_SECONDS
+    return [_file_report(path, mtime) for path, mtime in sorted(files.items()) if mtime > cutoff]
+
+class InotifyWatcher:
+    """Linux only: reports suspicious files as they are created or written, without rescanning."""
+
+    IN_MODIFY, IN_MOVED_TO, IN_CREATE = 0x2, 0x80, 0x100
+    IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR = 0x4000, 0x8000, 0x40000000
+    MASK = IN_MODIFY | IN_MOVED_TO | IN_CREATE
+    EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length; the name follows
+
+    def __init__(self, locations=None, extensions=SUSPICIOUS_EXTENSIONS, index_path=INDEX_FILE):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.locations = locations or suspicious_locations()
+        self.extensions = extensions
+        self.index_path = index_path  # directory index used to catch up after a queue overflow, or None
+        self.paths = {}  # watch descriptor -> directory
+        self.reported = set()
+        self.full = False
+        for location in self.locations:
+            self._watch_tree(location)
+
+    def _watch_tree(self, root):
+        # Watches are per directory, so a tree is walked once when it appears; returns the suspicious
+        # files already inside it (a directory moved in arrives with its contents)
+        found = []
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+            if wd < 0:
+                if ctypes.get_errno() == errno.ENOSPC and not self.full:
+                    self.full = True
+                    print("⚠️ inotify watch limit reached (fs.inotify.max_user_watches); some directories are not watched")
+                continue
+            self.paths[wd] = path
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(self.extensions):
+                            found.append(entry.path)
+            except OSError:
+                continue
+        return found
+
+    def poll(self):
+        """Suspicious files created or written since the last call; never blocks."""
+        candidates = []
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                name = data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0")
+                offset += self.EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & self.IN_IGNORED:
+                    self.paths.pop(wd, None)
+                    continue
+                directory = self.paths.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        candidates.extend(self._watch_tree(path))
+                elif path.endswith(self.extensions):
+                    candidates.append(path)
+        if overflow:
+            # The kernel dropped events: fall back to one (incremental) scan to catch up
+            index = load_index(self.index_path) if self.index_path else None
+            index, files, _ = scan_locations(self.locations, index, self.extensions)
+            if self.index_path:
+                try:
+                    save_index(self.index_path, index)
+                except OSError:
+                    pass
+            cutoff = time.time() - RECENT_SECONDS
+            candidates.extend(path for path, mtime in files.items() if mtime > cutoff)
 
-def detect_keyloggers():
+        reports = []
+        for path in dict.fromkeys(candidates):
+            if path in self.reported:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            self.reported.add(path)
+            reports.append(_file_report(path, mtime))
+        return reports
+
+    def close(self):
+        os.close(self.fd)
+
+def inspect_process(process_info, pattern=KEYLOGGER_PATTERN):
+    """Return a report dict if the process looks like a keylogger, else None."""
+    name = str(process_info.get('name', '')).lower()
+    exe_path = str(process_info.get('exe', '')).lower()
+    cmdline = process_info.get('cmdline', [])
+    cmdline_str = ' '.join(str(cmd) for cmd in cmdline).lower() if cmdline else ''
+    username = process_info.get('username')
+
+    # Skip system processes
+    if username and ('system' in username.lower() or 'local service' in username.lower()):
+        return None
+
+    # One search over all three fields; NUL separators keep a match from spanning two of them
+    match = pattern.search(f"{name}\0{exe_path}\0{cmdline_str}")
+    if match:
+        if match.start() < len(name):
+            field = 'name'
+        elif match.start() < len(name) + 1 + len(exe_path):
+            field = 'exe'
+        else:
+            field = 'cmdline'
+        return {
+            'pid': process_info['pid'],
+            'name': process_info['name'],
+            'exe': process_info.get('exe', 'Unknown'),
+            'cmdline': process_info.get('cmdline') or [],
+            'username': username,
+            'keyword': match.group(),
+            'field': field
+        }
+    return None
+
+def print_process(proc):
+    print(f"\nPID: {proc['pid']}")
+    print(f"Name: {proc['name']}")
+    print(f"Executable: {proc['exe']}")
+    print(f"Command line: {' '.join(proc['cmdline'])}")
+    print(f"User: {proc['username']}")
+    print(f"Matched: '{proc['keyword']}' in {proc['field']}")
+
+class ProcessWatcher:
+    """Incremental process scanner: only processes started since the last tick are inspected."""
+
+    def __init__(self, pattern=KEYLOGGER_PATTERN, verify_every=30):
+        self.pattern = pattern
+        # pid -> create_time of every process already inspected; (pid, create_time) identifies a process
+        # even after its pid is reused
+        self.seen = {}
+        self.verify_every = verify_every
+        self.ticks = 0
+
+    def _inspect_new(self, pid):
+        try:
+            process = psutil.Process(pid)
+            with process.oneshot():
+                create_time = process.create_time()
+                info = process.as_dict(attrs=PROCESS_ATTRS)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None
+        except psutil.AccessDenied:
+            # Cache it anyway so an unreadable process is not retried on every tick
+            self.seen[pid] = None
+            return None
+        self.seen[pid] = create_time
+        return inspect_process(info, self.pattern)
+
+    def _reused_pids(self, pids):
+        # A pid that exited and was handed to a new process between two ticks looks unchanged in the
+        # pid list, so every verify_every ticks the cached create times are re-checked (cheap stat reads)
+        reused = []
+        for pid in pids:
+            try:
+                if self.seen[pid] is not None and psutil.Process(pid).create_time() != self.seen[pid]:
+                    reused.append(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return reused
+
+    def tick(self):
+        """One scan: returns (suspicious processes among the new ones, new count, exited count)."""
+        self.ticks += 1
+        current = set(psutil.pids())
+        exited = self.seen.keys() - current
+        for pid in exited:
+            del self.seen[pid]
+        new = current - self.seen.keys()
+        if self.verify_every and self.ticks % self.verify_every == 0:
+            new.update(self._reused_pids(current & self.seen.keys()))
+        suspicious = []
+        for pid in sorted(new):
+            proc = self._inspect_new(pid)
+            if proc:
+                suspicious.append(proc)
+        return suspicious, len(new), len(exited)
+
+def watch_processes(interval=2.0, pattern=KEYLOGGER_PATTERN, file_watcher=None):
+    """Keep watching for new keylogger-like processes (and files, given an InotifyWatcher) until Ctrl+C."""
+    watcher = ProcessWatcher(pattern)
+    alerts = 0
+    print(f"\n👀 Watching processes every {interval:g}s (Ctrl+C to stop)...")
+    if file_watcher:
+        print(f"👀 Watching {len(file_watcher.paths)} directories with inotify")
+    try:
+        while True:
+            started = time.perf_counter()
+            suspicious, new, exited = watcher.tick()
+            elapsed = (time.perf_counter() - started) * 1000
+            if watcher.ticks == 1:
+                print(f"Baseline: {new} processes inspected in {elapsed:.1f} ms")
+            elif new or exited:
+                print(f"[{datetime.now():%H:%M:%S}] +{new} -{exited} processes ({elapsed:.1f} ms)")
+            for proc in suspicious:
+                alerts += 1
+                print("\n⚠️ Suspicious process detected:")
+                print_process(proc)
+            for file in file_watcher.poll() if file_watcher else []:
+                alerts += 1
+                print("\n⚠️ Suspicious file written:")
+                print(f"Path: {file['path']}")
+                print(f"Last modified: {file['modified']}")
+            time.sleep(max(interval - (time.perf_counter() - started), 0))
+    except KeyboardInterrupt:
+        print(f"\n🛡️ Stopped after {watcher.ticks} ticks, {alerts} alerts, {len(watcher.seen)} processes tracked")
+
+def detect_keyloggers(pattern=KEYLOGGER_PATTERN, index_path=INDEX_FILE, workers=None):
     """Detect potential keylogger processes and suspicious files."""
-    # Common keywords found in keylogger process names or descriptions
-    keylogger_keywords = [
-        "keylogger", "hook", "keyboard", "logger", "spy", "monitor", "capture",
-        "input", "record", "track", "type", "keys", "intercept", "listen"
-    ]
     suspicious_processes = []
     total_processes = 0
 
     print("\n🔍 Scanning running processes for keylogger-like activity...")
 
-    for process in psutil.process_iter(['pid', 'name', 'exe', 'cmdline', 'username']):
+    for process in psutil.process_iter(PROCESS_ATTRS):
         total_processes += 1
         try:
-            process_info = process.info
-            name = str(process_info.get('name', '')).lower()
-            exe_path = str(process_info.get('exe', '')).lower()
-            cmdline = process_info.get('cmdline', [])
-            cmdline_str = ' '.join(str(cmd) for cmd in cmdline).lower() if cmdline else ''
-            username = process_info.get('username')
-
-            # Skip system processes
-            if username and ('system' in username.lower() or 'local service' in username.lower()):
-                continue
-
-            # Check if any keyword is present in the process details
-            if any(keyword in name or keyword in exe_path or keyword in cmdline_str 
-                  for keyword in keylogger_keywords):
-                suspicious_processes.append({
-                    'pid': process_info['pid'],
-                    'name': process_info['name'],
-                    'exe': process_info.get('exe', 'Unknown'),
-                    'cmdline': process_info.get('cmdline', []),
-                    'username': username
-                })
+            proc = inspect_process(process.info, pattern)
+            if proc:
+                suspicious_processes.append(proc)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             continue
 
     # Check for suspicious files
-    suspicious_files = check_suspicious_paths()
+    suspicious_files = check_suspicious_paths(index_path=index_path, workers=workers)
     
     print(f"\n📊 Scan Results:")
     print(f"Total processes scanned: {total_processes}")
@@ -89,11 +417,7 @@ def detect_keyloggers():
     if suspicious_processes:
         print("\n⚠️ Suspicious processes detected:")
         for proc in suspicious_processes:
-            print(f"\nPID: {proc['pid']}")
-            print(f"Name: {proc['name']}")
-            print(f"Executable: {proc['exe']}")
-            print(f"Command line: {' '.join(proc['cmdline'])}")
-            print(f"User: {proc['username']}")
+            print_process(proc)
     else:
         print("\n✅ No suspicious processes detected")
     
@@ -107,7 +431,84 @@ def detect_keyloggers():
     
     print("\n🛡️ Scan complete!")
 
+def synthetic_process_table(count, seed=0):
+    """Process infos shaped like psutil's, with a keyword planted in about 1% of them."""
+    rng = random.Random(seed)
+    parts = ["/usr/bin/python3", "-m", "http.server", "--no-sandbox", "--renderer", "-Xmx2g",
+             "/opt/app/lib/app.jar", "--enable-features=WebRTC", "-Dfile.encoding=UTF-8", "--port=8080",
+             "/usr/lib/jvm/java-17/bin/java", "org.example.Main", "--config", "/etc/app/app.conf"]
+    table = []
+    for pid in range(1, count + 1):
+        name = f"proc{rng.randrange(100000)}"
+        cmdline = [rng.choice(parts) for _ in range(int(rng.expovariate(1 / 6)))]
+        if rng.random() < 0.01:
+            cmdline.append(f"--{rng.choice(KEYLOGGER_KEYWORDS)}")
+        table.append({'pid': pid, 'name': name, 'exe': f"/usr/bin/{name}", 'cmdline': cmdline,
+                      'username': 'user'})
+    return table
+
+def _matches_any(process_info, keywords):
+    # The previous matcher: every keyword tested against every field
+    name = str(process_info.get('name', '')).lower()
+    exe_path = str(process_info.get('exe', '')).lower()
+    cmdline = process_info.get('cmdline', [])
+    cmdline_str = ' '.join(str(cmd) for cmd in cmdline).lower() if cmdline else ''
+    return any(keyword in name or keyword in exe_path or keyword in cmdline_str for keyword in keywords)
+
+def benchmark_matchers(count=10000, keywords=KEYLOGGER_KEYWORDS, repeat=5):
+    """Time the compiled matcher against the per-keyword any() loop on a synthetic process table."""
+    table = synthetic_process_table(count)
+    pattern = compile_keywords(keywords)
+    keywords = [keyword.lower() for keyword in keywords]
+
+    def best(func):
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - started)
+        return min(times), result
+
+    old_time, old_hits = best(lambda: [info['pid'] for info in table if _matches_any(info, keywords)])
+    new_time, new_hits = best(lambda: [info['pid'] for info in table if inspect_process(info, pattern)])
+    assert old_hits == new_hits, "matchers disagree"
+    print(f"\n⏱️ {count} processes, {len(keywords)} keywords, {len(new_hits)} matches")
+    print(f"any() per keyword: {old_time * 1000:8.1f} ms")
+    print(f"compiled pattern:  {new_time * 1000:8.1f} ms ({old_time / new_time:.1f}x)")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Detect keylogger-like processes and files")
+    parser.add_argument("-w", "--watch", action="store_true",
+                        help="Keep monitoring and inspect only newly started processes")
+    parser.add_argument("-i", "--interval", type=float, default=2.0, help="Seconds between watch ticks")
+    parser.add_argument("--inotify", action="store_true",
+                        help="Also report suspicious files as they are written, via inotify (Linux; implies --watch)")
+    parser.add_argument("--index", default=INDEX_FILE, help="Directory index reused between file scans")
+    parser.add_argument("--no-index", action="store_true", help="List every directory, keep no index")
+    parser.add_argument("-j", "--workers", type=int, help="Threads for the directory walk")
+    parser.add_argument("-k", "--keywords", metavar="FILE",
+                        help="Keyword file, one per line (default: the built-in list)")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=10000, metavar="N",
+                        help="Compare matchers on a synthetic table of N processes and exit")
+    args = parser.parse_args()
+
+    try:
+        keywords = load_keywords(args.keywords) if args.keywords else KEYLOGGER_KEYWORDS
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot load keywords: {e}")
+    pattern = compile_keywords(keywords)
+
     print("🔍 Keylogger Detector")
     print("=====================")
-    detect_keyloggers()
+    if args.benchmark:
+        benchmark_matchers(args.benchmark, keywords)
+    elif args.watch or args.inotify:
+        file_watcher = None
+        if args.inotify:
+            try:
+                file_watcher = InotifyWatcher(index_path=None if args.no_index else args.index)
+            except (AttributeError, OSError) as e:
+                parser.error(f"inotify is not available: {e}")
+        watch_processes(args.interval, pattern, file_watcher)
+    else:
+        detect_keyloggers(pattern, None if args.no_index else args.index, args.workers)
@@ -1,5 +1,20 @@
+import argparse
 import hashlib
+import heapq
+import mmap
 import os
+import struct
+import tempfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HASH_DB = os.path.join(SCRIPT_DIR, "known_hashes.txt")
+# Compiled form of the feed: a header, fixed-width records sorted by digest, then a name table
+INDEX_MAGIC = b"MHIDX\x00\x00\x01"
+INDEX_HEADER = struct.Struct("<8sQQQq")  # magic, record count, feed size, name table offset, feed mtime_ns
+RECORD = struct.Struct("<32sQ")  # SHA256 digest, offset of its entry in the name table
+NAME_ENTRY = struct.Struct("<II")  # name length, description length; the UTF-8 text follows
+RUN_RECORD = struct.Struct(">32sQQ")  # digest, feed line number, name offset; sorts by digest, then line
+RUN_SIZE = 1_000_000  # records sorted in memory at once while compiling
 
 def get_file_hash(filename):
     hash_func = hashlib.sha256()
@@ -8,46 +23,214 @@ def get_file_hash(filename):
             hash_func.update(chunk)
     return hash_func.hexdigest()
 
-def check_malware(filename):
+def default_index_path(hash_db_path):
+    return os.path.splitext(hash_db_path)[0] + ".idx"
+
+def parse_feed_line(line):
+    """-> (hash, name, description) for a feed line, or None for blanks and comments."""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    parts = line.split('|')
+    if len(parts) >= 2:
+        description = parts[2] if len(parts) > 2 else "No description available"
+        return parts[0].lower(), parts[1], description
+    # Handle old format (hash only)
+    return line.lower(), "Unknown Malware", "Legacy hash entry"
+
+def _write_run(records, directory):
+    records.sort()
+    run = tempfile.TemporaryFile(dir=directory)
+    run.write(b"".join(records))
+    run.seek(0)
+    return run
+
+def _read_run(run):
+    while True:
+        record = run.read(RUN_RECORD.size)
+        if not record:
+            return
+        yield record
+
+def compile_feed(hash_db_path=HASH_DB, index_path=None):
+    """
+    Compile a HASH|NAME|DESCRIPTION feed into a sorted binary index for HashIndex. Records are sorted
+    in runs of RUN_SIZE and merged from temporary files, so memory stays bounded for any feed size.
+    Returns (index path, records written, lines skipped).
+    """
+    index_path = index_path or default_index_path(hash_db_path)
+    directory = os.path.dirname(os.path.abspath(index_path))
+    stat = os.stat(hash_db_path)
+    names = tempfile.TemporaryFile(dir=directory)
+    # Families repeat across a feed, so each (name, description) pair is stored once
+    name_offsets = {}
+    runs, records, skipped = [], [], 0
+    try:
+        with open(hash_db_path, "r", encoding="utf-8", errors="replace") as f:
+            for line_number, line in enumerate(f):
+                entry = parse_feed_line(line)
+                if entry is None:
+                    continue
+                try:
+                    digest = bytes.fromhex(entry[0])
+                except ValueError:
+                    digest = b""
+                if len(digest) != 32:
+                    skipped += 1
+                    continue
+                offset = name_offsets.get(entry[1:])
+                if offset is None:
+                    offset = name_offsets[entry[1:]] = names.tell()
+                    name, description = entry[1].encode(), entry[2].encode()
+                    names.write(NAME_ENTRY.pack(len(name), len(description)) + name + description)
+                records.append(RUN_RECORD.pack(digest, line_number, offset))
+                if len(records) >= RUN_SIZE:
+                    runs.append(_write_run(records, directory))
+                    records = []
+        runs.append(_write_run(records, directory))
+
+        count = 0
+        tmp = index_path + ".tmp"
+        with open(tmp, "wb") as out:
+            out.write(b"\0" * INDEX_HEADER.size)
+            previous = None
+            for record in heapq.merge(*(_read_run(run) for run in runs)):
+                digest, _, offset = RUN_RECORD.unpack(record)
+                # Duplicates are adjacent and in feed order; the last line for a hash wins, as with a dict
+                if digest == previous:
+                    out.seek(-RECORD.size, os.SEEK_CUR)
+                    count -= 1
+                out.write(RECORD.pack(digest, offset))
+                previous = digest
+                count += 1
+            names.seek(0)
+            names_offset = out.tell()
+            for chunk in iter(lambda: names.read(1 << 20), b""):
+                out.write(chunk)
+            out.seek(0)
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, count, stat.st_size, names_offset, stat.st_mtime_ns))
+        os.replace(tmp, index_path)
+    finally:
+        names.close()
+        for run in runs:
+            run.close()
+    return index_path, count, skipped
+
+class HashIndex:
+    """Memory-mapped view of a compiled index: opening it is O(1), each lookup a binary search."""
+
+    def __init__(self, index_path):
+        with open(index_path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.feed_size, self.names_offset, self.feed_mtime = \
+            INDEX_HEADER.unpack_from(self.map)
+        if magic != INDEX_MAGIC:
+            self.map.close()
+            raise ValueError(f"{index_path} is not a compiled hash index")
+
+    def is_current(self, hash_db_path):
+        """Whether the index was compiled from the feed as it is now."""
+        try:
+            stat = os.stat(hash_db_path)
+        except FileNotFoundError:
+            return True  # the index may be shipped without its feed
+        return (stat.st_size, stat.st_mtime_ns) == (self.feed_size, self.feed_mtime)
+
+    def lookup(self, file_hash):
+        """(name, description) for a hex SHA256 string, or None if it is not in the index."""
+        try:
+            digest = bytes.fromhex(file_hash)
+        except ValueError:
+            return None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            position = INDEX_HEADER.size + middle * RECORD.size
+            if self.map[position:position + 32] < digest:
+                low = middle + 1
+            else:
+                high = middle
+        position = INDEX_HEADER.size + low * RECORD.size
+        if low == self.count or self.map[position:position + 32] != digest:
+            return None
+        entry = self.names_offset + RECORD.unpack_from(self.map, position)[1]
+        name_length, description_length = NAME_ENTRY.unpack_from(self.map, entry)
+        text = self.map[entry + NAME_ENTRY.size:entry + NAME_ENTRY.size + name_length + description_length]
+        return text[:name_length].decode(), text[name_length:].decode()
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_database(hash_db_path=HASH_DB, index_path=None):
+    """Open the compiled index for a feed, compiling it first if it is missing or older than the feed."""
+    index_path = index_path or default_index_path(hash_db_path)
+    if os.path.exists(index_path):
+        try:
+            index = HashIndex(index_path)
+        except (ValueError, struct.error):
+            index = None  # empty, truncated or foreign file: rebuild it
+        if index and index.is_current(hash_db_path):
+            return index
+        if index:
+            index.close()
+    print(f"Compiling {hash_db_path} -> {index_path}...")
+    _, count, skipped = compile_feed(hash_db_path, index_path)
+    print(f"Indexed {count} hashes" + (f" ({skipped} non-SHA256 lines skipped)" if skipped else ""))
+    return HashIndex(index_path)
+
+def check_malware(filename, database=None):
     file_hash = get_file_hash(filename)
-    
-    # Get the directory where this script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    hash_db_path = os.path.join(script_dir, "known_hashes.txt")
-    
+
     try:
-        with open(hash_db_path, "r") as f:
-            malware_db = {}
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    parts = line.split('|')
-                    if len(parts) >= 2:
-                        hash_value = parts[0].lower()
-                        malware_name = parts[1]
-                        description = parts[2] if len(parts) > 2 else "No description available"
-                        malware_db[hash_value] = (malware_name, description)
-                    else:
-                        # Handle old format (hash only)
-                        malware_db[line.lower()] = ("Unknown Malware", "Legacy hash entry")
-
-        if file_hash in malware_db:
-            malware_name, description = malware_db[file_hash]
-            print(f"\n⚠️ WARNING: MALWARE DETECTED!")
-            print(f"File: {filename}")
-            print(f"Identified as: {malware_name}")
-            print(f"Description: {description}")
-            print(f"Hash (SHA256): {file_hash}")
-        else:
-            print(f"\n✅ File appears clean: {filename}")
-            print(f"Hash (SHA256): {file_hash}")
-            print("\nNote: This does not guarantee the file is safe.")
-            print("Always exercise caution with unknown files.")
+        index = database or open_database()
     except FileNotFoundError:
-        print(f"\nError: Database file not found: {hash_db_path}")
+        print(f"\nError: Database file not found: {HASH_DB}")
         print("Please ensure 'known_hashes.txt' exists in the same directory as this script.")
+        return
+
+    try:
+        match = index.lookup(file_hash)
+    finally:
+        if database is None:
+            index.close()
+
+    if match:
+        malware_name, description = match
+        print(f"\n⚠️ WARNING: MALWARE DETECTED!")
+        print(f"File: {filename}")
+        print(f"Identified as: {malware_name}")
+        print(f"Description: {description}")
+        print(f"Hash (SHA256): {file_hash}")
+    else:
+        print(f"\n✅ File appears clean: {filename}")
+        print(f"Hash (SHA256): {file_hash}")
+        print("\nNote: This does not guarantee the file is safe.")
+        print("Always exercise caution with unknown files.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check files against a database of known malware hashes")
+    parser.add_argument("files", nargs="*", help="Files to check (prompted for if omitted)")
+    parser.add_argument("--db", default=HASH_DB, help="Hash feed, one HASH|NAME|DESCRIPTION per line")
+    parser.add_argument("--index", help="Compiled index path (default: the feed path with .idx)")
+    parser.add_argument("--compile", action="store_true", help="Compile the feed into the index and exit")
+    args = parser.parse_args()
+
     print("Malware Hash Checker")
-    file = input("Enter the path to the file you want to check (e.g., C:\\path\\to\\your\\file.exe): ")
-    check_malware(file)
+    if args.compile:
+        path, count, skipped = compile_feed(args.db, args.index)
+        print(f"Indexed {count} hashes into {path}" + (f" ({skipped} non-SHA256 lines skipped)" if skipped else ""))
+    else:
+        files = args.files or [input("Enter the path to the file you want to check (e.g., C:\\path\\to\\your\\file.exe): ")]
+        try:
+            database = open_database(args.db, args.index)
+        except FileNotFoundError:
+            parser.error(f"database file not found: {args.db}")
+        with database:
+            for file in files:
+                check_malware(file, database)